@@ -3,22 +3,30 @@ Refactored candidate matching endpoints with proper error handling,
 logging, and validation.
 """
 
+import asyncio
 import logging
-from typing import List, Optional
+import re
+import orjson
+from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel, Field, field_validator
-from bson import ObjectId
 
 from app.db.mongo import get_database
 from app.repositories.candidate_repository import CandidateRepository
 from app.repositories.job_repository import JobRepository
-from app.services.matching_service import MatchingService
+from app.services.matching_service import MatchingService, get_shared_matching_service
+from app.services.semantic_cache import candidate_cache_key, match_result_cache
+from app.services.vector_index import job_vector_index
 from app.config import settings
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# 24 hex chars - same shape ObjectId.is_valid accepts for strings
+_OID_RE = re.compile(r"^[0-9a-fA-F]{24}$")
+
 # Create router
 router = APIRouter(
     prefix="/candidates",
@@ -78,14 +86,67 @@ def get_job_repo(
 def get_matching_service() -> MatchingService:
     """
     Dependency to get matching service.
-    Creates new instance per request but shares singleton model.
+    Returns the shared app-level instance (model and caches included).
+    """
+    return get_shared_matching_service()
+
+
+def build_job_filter_query(filters: MatchFilters) -> Dict[str, Any]:
+    """
+    Translate match filters into a MongoDB query so the database
+    only returns jobs that satisfy them.
+    """
+    query: Dict[str, Any] = {}
+
+    # Location filter (case-insensitive substring)
+    if filters.location:
+        query["location"] = {"$regex": re.escape(filters.location), "$options": "i"}
+
+    # Salary filter (jobs without the relevant bound are excluded)
+    if filters.min_salary:
+        query["salary_max"] = {"$gte": filters.min_salary}
+    if filters.max_salary:
+        query["salary_min"] = {"$lte": filters.max_salary}
+
+    # Skills filter (job must have ALL required skills).
+    # Matches the lowercased skills_normalized array stored on each job.
+    if filters.required_skills:
+        required = frozenset(s.lower() for s in filters.required_skills)
+        query["skills_normalized"] = {"$all": list(required)}
+
+    return query
+
+
+async def fetch_candidate_job_pool(
+        job_repo: JobRepository,
+        cand_vec: Optional[Any],
+        limit: int
+) -> list:
+    """
+    Fetch the jobs to score for a candidate.
+
+    Uses the job vector index to shortlist the nearest jobs by embedding
+    when it is ready and large enough; otherwise returns up to
+    MAX_JOBS_PER_QUERY jobs.
     """
-    return MatchingService()
+    shortlist_size = limit * settings.ANN_OVERSAMPLE
+    if (
+        cand_vec is not None
+        and settings.USE_ANN_INDEX
+        and job_vector_index.ready
+        and len(job_vector_index) > shortlist_size
+    ):
+        # Score only the nearest jobs by embedding
+        job_ids = await asyncio.to_thread(job_vector_index.search, cand_vec, shortlist_size)
+        return await job_repo.list_by_ids(job_ids)
+
+    # Fetch jobs (consider adding filters here for active jobs only)
+    return await job_repo.list(limit=settings.MAX_JOBS_PER_QUERY)
 
 
 def validate_object_id(id_string: str) -> str:
     """Validate that a string is a valid MongoDB ObjectId."""
-    if not ObjectId.is_valid(id_string):
+    if not _OID_RE.match(id_string):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid ID format: {id_string}"
@@ -146,29 +207,49 @@ async def match_jobs_for_candidate(
                 detail=f"Candidate {candidate_id} not found"
             )
 
-        # Fetch jobs (consider adding filters here for active jobs only)
-        jobs = await job_repo.list(limit=settings.MAX_JOBS_PER_QUERY)
+        # Reuse the ranking of a near-identical profile, if one is cached
+        cache_key = candidate_cache_key(candidate, min_score, limit)
+        try:
+            cand_vec = await asyncio.to_thread(matcher.get_candidate_vector, candidate)
+            cached = match_result_cache.lookup(cand_vec, cache_key)
+        except Exception as e:
+            logger.warning(f"Semantic cache unavailable for candidate {candidate_id}: {e}")
+            cand_vec, cached = None, None
+
+        if cached is not None:
+            total_evaluated, matches = cached
+            logger.info(f"Using cached matches for candidate {candidate.name}")
+        else:
+            generation = match_result_cache.generation
+            jobs = await fetch_candidate_job_pool(job_repo, cand_vec, limit)
+
+            if not jobs:
+                logger.info("No jobs available for matching")
+                return {
+                    "summary": {
+                        "candidate_id": candidate_id,
+                        "candidate_name": candidate.name,
+                        "total_jobs_evaluated": 0,
+                        "matches_found": 0,
+                        "top_score": None,
+                    },
+                    "matches": []
+                }
 
-        if not jobs:
-            logger.info("No jobs available for matching")
-            return {
-                "summary": {
-                    "candidate_id": candidate_id,
-                    "candidate_name": candidate.name,
-                    "total_jobs_evaluated": 0,
-                    "matches_found": 0,
-                    "top_score": None,
-                },
-                "matches": []
-            }
+            # Perform matching
+            logger.info(f"Evaluating {len(jobs)} jobs for candidate {candidate.name}")
+            matches = await matcher.rank_jobs_two_stage_async(
+                candidate=candidate,
+                jobs=jobs,
+                min_score=min_score,
+                k=limit
+            )
+            total_evaluated = len(jobs)
 
-        # Perform matching
-        logger.info(f"Evaluating {len(jobs)} jobs for candidate {candidate.name}")
-        matches = matcher.rank_jobs_for_candidate(
-            candidate=candidate,
-            jobs=jobs,
-            min_score=min_score
-        )
+            if cand_vec is not None:
+                match_result_cache.store(
+                    cand_vec, cache_key, (total_evaluated, matches), generation=generation
+                )
 
         # Apply limit
         matches = matches[:limit]
@@ -194,7 +275,7 @@ async def match_jobs_for_candidate(
         summary = {
             "candidate_id": candidate_id,
             "candidate_name": candidate.name,
-            "total_jobs_evaluated": len(jobs),
+            "total_jobs_evaluated": total_evaluated,
             "matches_found": len(match_results),
             "top_score": match_results[0]["score"] if match_results else None,
             "filters_applied": {
@@ -208,10 +289,11 @@ async def match_jobs_for_candidate(
             f"(top score: {summary['top_score']})"
         )
 
-        return {
+        # orjson serializes the dumped models directly (no jsonable_encoder pass)
+        return ORJSONResponse({
             "summary": summary,
             "matches": match_results
-        }
+        })
 
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -228,6 +310,99 @@ async def match_jobs_for_candidate(
         )
 
 
+@router.get("/{candidate_id}/matches/stream")
+async def stream_jobs_for_candidate(
+        candidate_id: str,
+        min_score: float = Query(default=40.0, ge=0, le=100),
+        limit: int = Query(
+            default=settings.DEFAULT_MATCH_LIMIT,
+            ge=1,
+            le=500,
+            description="Maximum number of results"
+        ),
+        include_breakdown: bool = Query(default=True),
+        candidate_repo: CandidateRepository = Depends(get_candidate_repo),
+        job_repo: JobRepository = Depends(get_job_repo),
+        matcher: MatchingService = Depends(get_matching_service),
+):
+    """
+    Stream matching jobs for a candidate as newline-delimited JSON.
+
+    **Lines:**
+    - First: {"summary": {...}} with the number of jobs being evaluated
+    - Then: one {"match": {...}} per match, in scoring order (unsorted)
+    - Last: {"done": {...}} with the ids of the final top matches, best first
+
+    A streamed match can be pushed out of the top `limit` by a later,
+    better one; use the final line to get the ranked top list.
+    """
+    validate_object_id(candidate_id)
+
+    logger.info(f"Streaming matches for candidate {candidate_id} (min_score={min_score})")
+
+    candidate = await candidate_repo.get(candidate_id)
+    if not candidate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Candidate {candidate_id} not found"
+        )
+
+    try:
+        cand_vec = await asyncio.to_thread(matcher.get_candidate_vector, candidate)
+    except Exception as e:
+        logger.warning(f"Candidate embedding unavailable for {candidate_id}: {e}")
+        cand_vec = None
+
+    jobs = await fetch_candidate_job_pool(job_repo, cand_vec, limit)
+
+    async def generate():
+        yield orjson.dumps({
+            "summary": {
+                "candidate_id": candidate_id,
+                "candidate_name": candidate.name,
+                "total_jobs_evaluated": len(jobs),
+                "filters_applied": {
+                    "min_score": min_score,
+                    "limit": limit
+                }
+            }
+        }) + b"\n"
+
+        top: List[Dict[str, Any]] = []
+        try:
+            async for match in matcher.rank_jobs_stream(candidate, jobs, min_score, limit):
+                result = {
+                    "job": match["job"].model_dump(),
+                    "score": match["score"],
+                    "semantic_score": match["semantic_score"],
+                    "rule_score": match["rule_score"],
+                    "match_reasons": match["match_reasons"],
+                }
+                if include_breakdown:
+                    result["breakdown"] = match["breakdown"]
+
+                top.append(match)
+                yield orjson.dumps({"match": result}) + b"\n"
+
+        except Exception as e:
+            # Headers are already sent; report the failure in-band
+            logger.error(f"Error streaming matches for candidate {candidate_id}: {e}", exc_info=True)
+            yield orjson.dumps({"error": "An error occurred while matching jobs"}) + b"\n"
+            return
+
+        top.sort(key=lambda m: m["score"], reverse=True)
+        top = top[:limit]
+        yield orjson.dumps({
+            "done": {
+                "matches_found": len(top),
+                "top_score": top[0]["score"] if top else None,
+                "job_ids": [m["job"].id for m in top]
+            }
+        }) + b"\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @router.get("/{candidate_id}/matches/top")
 async def get_top_match(
         candidate_id: str,
@@ -256,10 +431,11 @@ async def get_top_match(
         if not jobs:
             return {"top_match": None}
 
-        matches = matcher.rank_jobs_for_candidate(
+        matches = await matcher.rank_jobs_two_stage_async(
             candidate=candidate,
             jobs=jobs,
-            min_score=settings.MIN_MATCH_SCORE
+            min_score=settings.MIN_MATCH_SCORE,
+            k=1
         )
 
         if not matches:
@@ -267,14 +443,14 @@ async def get_top_match(
 
         top = matches[0]
 
-        return {
+        return ORJSONResponse({
             "top_match": {
                 "job": top["job"].model_dump(),
                 "score": top["score"],
                 "match_reasons": top["match_reasons"],
                 "breakdown": top["breakdown"]
             }
-        }
+        })
 
     except HTTPException:
         raise
@@ -315,40 +491,23 @@ async def match_with_filters(
                 detail="Candidate not found"
             )
 
-        # Fetch all jobs (in production, push filters to database query)
-        all_jobs = await job_repo.list(limit=settings.MAX_JOBS_PER_QUERY)
-
-        # Apply filters
-        filtered_jobs = []
-        for job in all_jobs:
-            # Location filter
-            if filters.location and filters.location.lower() not in job.location.lower():
-                continue
-
-            # Salary filter
-            if filters.min_salary and (job.salary_max is None or job.salary_max < filters.min_salary):
-                continue
-            if filters.max_salary and (job.salary_min is None or job.salary_min > filters.max_salary):
-                continue
-
-            # Skills filter (job must have ALL required skills)
-            if filters.required_skills:
-                job_skills = set(s.lower() for s in job.requirements + job.advantages)
-                required = set(s.lower() for s in filters.required_skills)
-                if not required.issubset(job_skills):
-                    continue
-
-            filtered_jobs.append(job)
+        # Let MongoDB apply the filters instead of scanning every job here
+        query = build_job_filter_query(filters)
+        total_jobs = await job_repo.count()
+        filtered_jobs = await job_repo.list(
+            limit=settings.MAX_JOBS_PER_QUERY,
+            query=query
+        )
 
         logger.info(
-            f"Filtered from {len(all_jobs)} to {len(filtered_jobs)} jobs "
+            f"Filtered from {total_jobs} to {len(filtered_jobs)} jobs "
             f"based on criteria"
         )
 
         if not filtered_jobs:
             return {
                 "summary": {
-                    "total_jobs": len(all_jobs),
+                    "total_jobs": total_jobs,
                     "after_filters": 0,
                     "matches_found": 0
                 },
@@ -356,15 +515,16 @@ async def match_with_filters(
             }
 
         # Perform matching on filtered jobs
-        matches = matcher.rank_jobs_for_candidate(
+        matches = await matcher.rank_jobs_two_stage_async(
             candidate=candidate,
             jobs=filtered_jobs,
-            min_score=min_score
+            min_score=min_score,
+            k=None
         )
 
-        return {
+        return ORJSONResponse({
             "summary": {
-                "total_jobs": len(all_jobs),
+                "total_jobs": total_jobs,
                 "after_filters": len(filtered_jobs),
                 "matches_found": len(matches),
                 "filters_applied": filters.model_dump()
@@ -380,7 +540,7 @@ async def match_with_filters(
                 }
                 for m in matches
             ]
-        }
+        })
 
     except HTTPException:
         raise
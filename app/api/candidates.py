@@ -1,12 +1,11 @@
 from typing import List
-from datetime import datetime  # Add this
-from bson import ObjectId  # Add this
 
 from app.domain.models import CandidateUpdate
 from app.repositories.job_repository import JobRepository
-from app.services.matching_service import MatchingService
+from app.services.matching_service import get_shared_matching_service
+from app.api.candidate_matches import validate_object_id
 
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 
 import json
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
@@ -80,11 +79,9 @@ async def recommended_jobs_for_candidate(
 
     jobs = await job_repo.list(skip=0, limit=1000)
 
-    matcher = MatchingService()
-    ranked = matcher.rank_jobs_for_candidate(candidate, jobs)
-
+    matcher = get_shared_matching_service()
     # Optional: filter weak matches
-    ranked = [r for r in ranked if r["score"] >= 40]
+    ranked = await matcher.rank_jobs_for_candidate_async(candidate, jobs, min_score=40)
 
     return [
         {
@@ -102,25 +99,47 @@ async def download_resume(cand_id: str, repo: CandidateRepository = Depends(get_
     if not resume:
         raise HTTPException(404, "Candidate not found")
 
+    resume_file_id = resume.get("resume_file_id")
     resume_file = resume.get("resume_file")
     resume_filename = resume.get("resume_filename") or "resume"
     resume_content_type = resume.get("resume_content_type") or "application/octet-stream"
+    headers = {"Content-Disposition": f'attachment; filename="{resume_filename}"'}
+
+    if resume_file_id:
+        # Stream from GridFS one chunk at a time
+        grid_out = await repo.open_resume_stream(resume_file_id)
+        return StreamingResponse(
+            _iter_grid_chunks(grid_out),
+            media_type=resume_content_type,
+            headers=headers,
+        )
 
     if not resume_file:
         raise HTTPException(404, "Resume not found for this candidate")
 
+    # Older candidates still have the bytes inline
     return Response(
         content=resume_file,
         media_type=resume_content_type,
-        headers={"Content-Disposition": f'attachment; filename="{resume_filename}"'},
+        headers=headers,
     )
 
+async def _iter_grid_chunks(grid_out):
+    while True:
+        chunk = await grid_out.readchunk()
+        if not chunk:
+            break
+        yield chunk
+
 @router.post("/{cand_id}/resume-upload")
 async def upload_resume(
     cand_id: str,
     file: UploadFile = File(...),
     repo: CandidateRepository = Depends(get_candidate_repo),
 ):
+    # Reject malformed ids before the repository builds an ObjectId
+    validate_object_id(cand_id)
+
     cand = await repo.get(cand_id)
     if not cand:
         raise HTTPException(404, "Candidate not found")
@@ -129,15 +148,12 @@ async def upload_resume(
     if not content:
         raise HTTPException(400, "Empty file")
 
-    # Store raw bytes in Mongo (works but keep files reasonably sized)
-    await repo.collection.update_one(
-        {"_id": ObjectId(cand_id)},
-        {"$set": {
-            "resume_file": content,
-            "resume_filename": file.filename,
-            "resume_content_type": file.content_type or "application/octet-stream",
-            "updated_at": datetime.utcnow(),
-        }},
+    # Store in GridFS (replaces any previous resume)
+    await repo.save_resume(
+        cand_id,
+        filename=file.filename,
+        content_type=file.content_type or "application/octet-stream",
+        content=content,
     )
 
     return {"ok": True, "filename": file.filename, "content_type": file.content_type}
\ No newline at end of file
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from typing import List
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.db.mongo import get_database
 from app.repositories.job_repository import JobRepository
 from app.domain.models import JobCreate, JobUpdate, JobDB
+from app.services.matching_service import get_shared_matching_service
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
@@ -12,8 +14,15 @@ def get_job_repo(db: AsyncIOMotorDatabase = Depends(get_database)) -> JobReposit
     return JobRepository(db)
 
 @router.post("", response_model=JobDB, status_code=201)
-async def create_job(payload: JobCreate, repo: JobRepository = Depends(get_job_repo)):
-    return await repo.create(payload)
+async def create_job(
+    payload: JobCreate,
+    background_tasks: BackgroundTasks,
+    repo: JobRepository = Depends(get_job_repo),
+):
+    job = await repo.create(payload)
+    # Encode and add to the vector index after the response is sent
+    background_tasks.add_task(get_shared_matching_service().index_jobs, [job])
+    return job
 
 @router.get("/{job_id}", response_model=JobDB)
 async def get_job(job_id: str, repo: JobRepository = Depends(get_job_repo)):
@@ -23,14 +32,29 @@ async def get_job(job_id: str, repo: JobRepository = Depends(get_job_repo)):
     return job
 
 @router.get("", response_model=List[JobDB])
-async def list_jobs(skip: int = 0, limit: int = 50, repo: JobRepository = Depends(get_job_repo)):
+async def list_jobs(
+    skip: int = 0,
+    limit: int = 50,
+    summary: bool = False,
+    repo: JobRepository = Depends(get_job_repo),
+):
+    if summary:
+        # List view: only id/title/location/salary/timestamps are fetched
+        summaries = await repo.list_summaries(skip=skip, limit=limit)
+        return ORJSONResponse([s.model_dump() for s in summaries])
     return await repo.list(skip=skip, limit=limit)
 
 @router.patch("/{job_id}", response_model=JobDB)
-async def update_job(job_id: str, payload: JobUpdate, repo: JobRepository = Depends(get_job_repo)):
+async def update_job(
+    job_id: str,
+    payload: JobUpdate,
+    background_tasks: BackgroundTasks,
+    repo: JobRepository = Depends(get_job_repo),
+):
     job = await repo.update(job_id, payload)
     if not job:
         raise HTTPException(404, "Job not found")
+    background_tasks.add_task(get_shared_matching_service().index_jobs, [job])
     return job
 
 @router.delete("/{job_id}", status_code=204)
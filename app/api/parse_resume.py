@@ -1,10 +1,23 @@
+import asyncio
 import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pdfplumber
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from app.services.ai_resume_parser import parse_resume_text
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/parse-resume", tags=["resume"])
 
+# PDF parsing is CPU-bound; keep it off the event loop
+_PDF_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pdf")
+
+# PDFium is not thread-safe, so only one thread may use it at a time
+_PDFIUM_LOCK = threading.Lock()
+
 @router.post("")
 async def parse_resume(file: UploadFile = File(...)):
     content = await file.read()
@@ -14,7 +27,8 @@ async def parse_resume(file: UploadFile = File(...)):
     filename = (file.filename or "").lower()
 
     if filename.endswith(".pdf"):
-        text = extract_pdf_text(content)
+        loop = asyncio.get_running_loop()
+        text = await loop.run_in_executor(_PDF_POOL, extract_pdf_text, content)
 
     elif filename.endswith(".txt"):
         # Try utf-8 first, then fallback safely
@@ -38,6 +52,27 @@ async def parse_resume(file: UploadFile = File(...)):
 
 
 def extract_pdf_text(binary: bytes) -> str:
+    # pypdfium2 is much faster; pdfplumber is the fallback
+    try:
+        return extract_pdf_text_pdfium(binary)
+    except Exception as e:
+        logger.debug(f"pypdfium2 extraction failed, falling back to pdfplumber: {e}")
+        return extract_pdf_text_pdfplumber(binary)
+
+
+def extract_pdf_text_pdfium(binary: bytes) -> str:
+    # Requires: pip install pypdfium2
+    import pypdfium2 as pdfium
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(binary)
+        try:
+            pages = [page.get_textpage().get_text_range() for page in pdf]
+        finally:
+            pdf.close()
+    return "\n".join(pages)
+
+
+def extract_pdf_text_pdfplumber(binary: bytes) -> str:
     with pdfplumber.open(io.BytesIO(binary)) as pdf:
         pages = [page.extract_text() or "" for page in pdf.pages]
     return "\n".join(pages)
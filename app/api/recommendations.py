@@ -1,13 +1,86 @@
+import asyncio
+import logging
+from operator import itemgetter
+
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.db.mongo import get_database
 from app.repositories.job_repository import JobRepository
-from app.repositories.candidate_repository import CandidateRepository
+from app.repositories.candidate_repository import CandidateRepository, MATCH_PROJECTION
+from app.services.matching_service import RANKING_POOL, get_shared_matching_service
 from app.services.recommendation_service import calculate_recommendation_score
+from app.services.semantic_cache import job_cache_key, recommendation_cache
+from app.services.vector_index import candidate_vector_index
+from app.config import settings
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/recommendations", tags=["recommendations"])
 
+# Scoring runs on the shared ranking pool so it doesn't block the event loop
+_SCORING_CHUNK_SIZE = 64
+
+
+def _score_chunk(job, candidates):
+    return [calculate_recommendation_score(job, candidate) for candidate in candidates]
+
+
+async def _vector_search_candidates(job, job_vec, cand_repo: CandidateRepository):
+    """Shortlist candidates with MongoDB $vectorSearch (None if unavailable)."""
+    try:
+        return await cand_repo.vector_search(
+            job_vec.tolist(),
+            limit=settings.VECTOR_SEARCH_LIMIT,
+            num_candidates=settings.VECTOR_SEARCH_NUM_CANDIDATES,
+            index_name=settings.CANDIDATE_VECTOR_INDEX,
+        )
+    except Exception as e:
+        # e.g. no vector index on this deployment: fall back to a scan
+        logger.warning(f"Vector search failed for job {job.id}, scanning candidates: {e}")
+        return None
+
+
+async def _ann_candidates(job_vec, cand_repo: CandidateRepository):
+    """Shortlist the candidates nearest to the job in the in-process candidate index."""
+    cand_ids = await asyncio.to_thread(
+        candidate_vector_index.search, job_vec, settings.VECTOR_SEARCH_LIMIT
+    )
+    return await cand_repo.list_by_ids(cand_ids)
+
+
+async def _score_candidates(job, job_vec, cand_repo: CandidateRepository):
+    """Shortlist, score and sort candidates for a job (highest score first)."""
+    # Get candidates: nearest by embedding when a vector index is available
+    candidates = None
+    if settings.USE_VECTOR_SEARCH and job_vec is not None:
+        candidates = await _vector_search_candidates(job, job_vec, cand_repo)
+    elif (
+        job_vec is not None
+        and settings.USE_ANN_INDEX
+        and settings.USE_ANN_RECOMMENDATIONS
+        and candidate_vector_index.ready
+        and len(candidate_vector_index) > settings.VECTOR_SEARCH_LIMIT
+    ):
+        candidates = await _ann_candidates(job_vec, cand_repo)
+    if candidates is None:
+        candidates = await cand_repo.list(limit=500, projection=MATCH_PROJECTION)
+
+    # Apply scoring logic to each candidate, one chunk per worker
+    loop = asyncio.get_running_loop()
+    scored_chunks = await asyncio.gather(*(
+        loop.run_in_executor(RANKING_POOL, _score_chunk, job, candidates[i:i + _SCORING_CHUNK_SIZE])
+        for i in range(0, len(candidates), _SCORING_CHUNK_SIZE)
+    ))
+
+    # Drop rejected candidates
+    results = [match for chunk in scored_chunks for match in chunk if match]
+
+    # Sort highest score first
+    results.sort(key=itemgetter("score"), reverse=True)
+    return results
+
 
 @router.get("/job/{job_id}")
 async def recommend_for_job(job_id: str, db: AsyncIOMotorDatabase = Depends(get_database)):
@@ -20,22 +93,23 @@ async def recommend_for_job(job_id: str, db: AsyncIOMotorDatabase = Depends(get_
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    # Get candidates
-    candidates = await cand_repo.list(limit=500)
-
-    results = []
+    # Reuse the ranking of a near-identical job post, if one is cached
+    cache_key = job_cache_key(job)
+    try:
+        job_vec = await asyncio.to_thread(get_shared_matching_service().get_job_vector, job)
+        results = recommendation_cache.lookup(job_vec, cache_key)
+    except Exception as e:
+        logger.warning(f"Semantic cache unavailable for job {job_id}: {e}")
+        job_vec, results = None, None
 
-    # Apply scoring logic to each candidate
-    for candidate in candidates:
-        match = calculate_recommendation_score(job, candidate)
-        if match:
-            results.append(match)
-
-    # Sort highest score first
-    results.sort(key=lambda x: x["score"], reverse=True)
+    if results is None:
+        generation = recommendation_cache.generation
+        results = await _score_candidates(job, job_vec, cand_repo)
+        if job_vec is not None:
+            recommendation_cache.store(job_vec, cache_key, results, generation=generation)
 
-    # Convert results to JSON-compatible output
-    return [
+    # Convert results to JSON-compatible output (serialized by orjson directly)
+    return ORJSONResponse([
         {
             "candidate": r["candidate"].model_dump(),
             "score": r["score"],
@@ -43,4 +117,4 @@ async def recommend_for_job(job_id: str, db: AsyncIOMotorDatabase = Depends(get_
             "rule_score": r["rule_score"],
         }
         for r in results
-    ]
+    ])
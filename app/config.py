@@ -18,17 +18,36 @@ class Settings(BaseSettings):
     # ========================
     MONGODB_URI: str = "mongodb://localhost:27017"
     MONGODB_DB: str = "jobmatcher"
+    MONGODB_MAX_POOL_SIZE: int = 200
+    MONGODB_MIN_POOL_SIZE: int = 20  # Connections kept open between bursts
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = 3000
+    MONGODB_COMPRESSORS: str = "zstd,zlib"  # zstd requires the zstandard package
 
     # ========================
     # Matching Service Settings
     # ========================
     # Embedding model for semantic matching
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    # "torch", or "onnx" to run an (optionally int8-quantized) ONNX export
+    EMBEDDING_BACKEND: str = "torch"
+    EMBEDDING_ONNX_QUANTIZATION: str = "avx512_vnni"  # arm64 | avx2 | avx512 | avx512_vnni | "" for fp32
+    EMBEDDING_ONNX_DIR: str = ".cache/onnx"  # Where exported/quantized models are kept
+    EMBEDDING_TORCH_INT8: bool = False  # int8 dynamic quantization of Linear layers (torch backend, CPU)
+    USE_BF16: bool = False  # BF16 inference via intel-extension-for-pytorch on AMX-capable CPUs
+    EMBEDDING_BATCH_SIZE: int = 64  # Texts per forward pass; raise on GPU until memory plateaus
+    EMBED_CONCURRENCY: int = 2  # Concurrent async encode calls (each uses half the cores)
+    EMBED_BATCH_WAIT_MS: float = 5.0  # Window for merging concurrent requests' texts into one encode
+    EMBED_BATCH_MAX: int = 128  # Max texts per merged encode
 
     # Cache settings
     ENABLE_CACHING: bool = True
     CACHE_SIZE: int = 1000  # Number of embeddings to cache
+    EMBEDDING_CACHE_INT8: bool = False  # Keep cached embeddings as int8 codes (half the memory of float16)
     CACHE_TTL: int = 3600  # Cache time-to-live in seconds (1 hour)
+    JOB_EMBEDDING_CACHE_SIZE: int = 10000  # Job embeddings kept across requests
+    EMBEDDING_LRU_SIZE: int = 4096  # In-process LRU in front of the MongoDB embeddings collection
+    SEMANTIC_CACHE_SIZE: int = 256  # Cached match results for similar candidates
+    SEMANTIC_CACHE_THRESHOLD: float = 0.98  # Min cosine similarity for a cache hit
 
     # Matching weights
     SEMANTIC_WEIGHT: float = 0.6  # Weight for semantic similarity
@@ -40,10 +59,29 @@ class Settings(BaseSettings):
     DEFAULT_MATCH_LIMIT: int = 50
     MIN_MATCH_SCORE: float = 40.0  # Default minimum score (0-100)
 
+    # Approximate nearest-neighbour shortlists for /matches and /recommendations
+    USE_ANN_INDEX: bool = True
+    # /recommendations rule-scores only the VECTOR_SEARCH_LIMIT nearest
+    # candidates by embedding; rule-strong candidates further away are missed
+    USE_ANN_RECOMMENDATIONS: bool = False
+    ANN_OVERSAMPLE: int = 3  # Shortlist size = limit * ANN_OVERSAMPLE
+    # Compressed FAISS index for very large corpora, e.g. "IVF4096,PQ32" ("" = HNSW)
+    ANN_INDEX_FACTORY: str = ""
+    ANN_NPROBE: int = 32  # IVF lists visited per query
+    ANN_USE_GPU: bool = False  # Move the factory index to all visible GPUs
+
+    # MongoDB $vectorSearch shortlist for /recommendations (Atlas or MongoDB 7+)
+    USE_VECTOR_SEARCH: bool = False
+    CANDIDATE_VECTOR_INDEX: str = "cand_emb_idx"
+    VECTOR_SEARCH_NUM_CANDIDATES: int = 200  # ANN candidates examined by MongoDB
+    VECTOR_SEARCH_LIMIT: int = 50  # Candidates shortlisted for rescoring (MongoDB or in-process index)
+
     # ========================
     # AI Parser Settings
     # ========================
+    OLLAMA_URL: str = "http://localhost:11434"
     OLLAMA_MODEL: str = "qwen2.5:1.5b"
+    OLLAMA_KEEP_ALIVE: str = "30m"  # How long the server keeps the model loaded
     OLLAMA_TIMEOUT: int = 120  # seconds
     OLLAMA_MAX_RETRIES: int = 3
 
@@ -1,7 +1,18 @@
+from datetime import datetime, timezone
 from typing import Optional
+from fastapi import Request
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from app.config import settings
 
+def utc_now() -> datetime:
+    """
+    Current UTC time truncated to milliseconds, the precision of a BSON
+    date, so a document built in memory equals the one read back.
+    """
+    now = datetime.now(timezone.utc)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
 class MongoClientFactory:
     _client: Optional[AsyncIOMotorClient] = None
     _db: Optional[AsyncIOMotorDatabase] = None
@@ -9,7 +20,14 @@ class MongoClientFactory:
     @classmethod
     def get_client(cls) -> AsyncIOMotorClient:
         if cls._client is None:
-            cls._client = AsyncIOMotorClient(settings.MONGODB_URI)
+            cls._client = AsyncIOMotorClient(
+                settings.MONGODB_URI,
+                maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+                minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+                serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+                compressors=settings.MONGODB_COMPRESSORS or None,
+                tz_aware=True,  # Read datetimes back as UTC-aware, like the ones we write
+            )
         return cls._client
 
     @classmethod
@@ -18,6 +36,16 @@ class MongoClientFactory:
             cls._db = cls.get_client()[settings.MONGODB_DB]
         return cls._db
 
-async def get_database() -> AsyncIOMotorDatabase:
-    # FastAPI dependency
-    return MongoClientFactory.get_db()
+    @classmethod
+    async def connect(cls) -> AsyncIOMotorClient:
+        """
+        Create the client and open a connection up front, so the first
+        request doesn't pay for server selection, TLS and auth.
+        """
+        client = cls.get_client()
+        await client.admin.command("ping")
+        return client
+
+async def get_database(request: Request) -> AsyncIOMotorDatabase:
+    # FastAPI dependency (client is created at startup and kept on app.state)
+    return request.app.state.mongo_client[settings.MONGODB_DB]
@@ -1,6 +1,8 @@
+import sys
 from enum import Enum
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from functools import cached_property, lru_cache
+from typing import Any, FrozenSet, List, Mapping, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
 
@@ -45,11 +47,48 @@ class EmploymentType(str, Enum):
     FREELANCE = "Freelance"
 
 
+# Store enum fields as their plain string values: documents are written to
+# MongoDB as strings, and models built with model_construct from stored
+# documents hold the same types as validated ones.
+ENUM_VALUES_CONFIG = ConfigDict(use_enum_values=True)
+
+
+def _normalized(value: str) -> str:
+    """Lowercased, stripped and interned, so equal values share one object."""
+    return sys.intern(value.lower().strip())
+
+
+@lru_cache(maxsize=None)
+def _cached_property_names(cls: type) -> Tuple[str, ...]:
+    return tuple(
+        name
+        for klass in cls.__mro__
+        for name, attr in vars(klass).items()
+        if isinstance(attr, cached_property)
+    )
+
+
+class _CachedViewsMixin:
+    """
+    Drops the cached lowercased views on model_copy. They live in the
+    instance __dict__, which pydantic copies as is, so an updated copy
+    would otherwise keep the values computed from the original fields.
+    """
+
+    def model_copy(self, *, update: Optional[Mapping[str, Any]] = None, deep: bool = False):
+        copied = super().model_copy(update=update, deep=deep)
+        for name in _cached_property_names(type(copied)):
+            copied.__dict__.pop(name, None)
+        return copied
+
+
 # ============================================================================
 # Updated Job Model
 # ============================================================================
 
 class JobCreate(BaseModel):
+    model_config = ENUM_VALUES_CONFIG
+
     title: str
     location: str
     description: str
@@ -80,6 +119,8 @@ class JobCreate(BaseModel):
 
 
 class JobUpdate(BaseModel):
+    model_config = ENUM_VALUES_CONFIG
+
     title: Optional[str] = None
     location: Optional[str] = None
     description: Optional[str] = None
@@ -99,8 +140,43 @@ class JobUpdate(BaseModel):
     benefits: Optional[List[str]] = None
 
 
-class JobDB(JobCreate):
+class JobDB(_CachedViewsMixin, JobCreate):
+    id: str
+    created_at: datetime
+    updated_at: datetime
+
+    @cached_property
+    def certifications_lower(self) -> FrozenSet[str]:
+        """Required certifications, lowercased once per loaded job."""
+        return frozenset(c.lower() for c in self.certifications_required)
+
+    # Lowercased views of the matching fields, built once per loaded job
+    # instead of on every (job, candidate) pair
+
+    @cached_property
+    def location_lower(self) -> str:
+        return _normalized(self.location)
+
+    @cached_property
+    def requirements_lower(self) -> Tuple[str, ...]:
+        return tuple(sys.intern(r.lower()) for r in self.requirements)
+
+    @cached_property
+    def advantages_lower(self) -> Tuple[str, ...]:
+        return tuple(sys.intern(a.lower()) for a in self.advantages)
+
+    @cached_property
+    def languages_lower(self) -> FrozenSet[str]:
+        return frozenset(_normalized(lang) for lang in self.required_languages)
+
+
+class JobSummary(BaseModel):
+    """List-view subset of a job."""
     id: str
+    title: str
+    location: str
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
     created_at: datetime
     updated_at: datetime
 
@@ -110,6 +186,8 @@ class JobDB(JobCreate):
 # ============================================================================
 
 class CandidateCreate(BaseModel):
+    model_config = ENUM_VALUES_CONFIG
+
     name: str
     location: str
     email: Optional[str] = None
@@ -145,6 +223,8 @@ class CandidateCreate(BaseModel):
 
 
 class CandidateUpdate(BaseModel):
+    model_config = ENUM_VALUES_CONFIG
+
     name: Optional[str] = None
     location: Optional[str] = None
     email: Optional[str] = None
@@ -164,7 +244,35 @@ class CandidateUpdate(BaseModel):
     salary_currency: Optional[str] = None
 
 
-class CandidateDB(CandidateCreate):
+class CandidateDB(_CachedViewsMixin, CandidateCreate):
     id: str
     created_at: datetime
-    updated_at: datetime
\ No newline at end of file
+    updated_at: datetime
+
+    # Normalized profile embedding, computed on create/update. Stored as a
+    # float array so MongoDB vector search can index it.
+    # Internal to matching; never returned by the API.
+    embedding: Optional[List[float]] = Field(default=None, exclude=True)
+
+    @cached_property
+    def certifications_lower(self) -> FrozenSet[str]:
+        """Certifications, lowercased once per loaded candidate."""
+        return frozenset(c.lower() for c in self.certifications)
+
+    @cached_property
+    def location_lower(self) -> str:
+        return _normalized(self.location)
+
+    @cached_property
+    def languages_lower(self) -> FrozenSet[str]:
+        return frozenset(_normalized(lang) for lang in self.languages)
+
+    @cached_property
+    def experience_lower(self) -> str:
+        """Lowercased experience, searched for recommendation requirements."""
+        return " ".join(self.experience).lower()
+
+    @cached_property
+    def match_text(self) -> str:
+        """Lowercased experience and skills, searched for job requirements."""
+        return f"{' '.join(self.experience).lower()} {' '.join(self.skills).lower()}"
\ No newline at end of file
@@ -5,15 +5,24 @@ Refactored main.py with proper logging, startup tasks, and error handling.
 import asyncio
 import sys
 import logging
+import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 
 from app.config import settings
 from app.db.mongo import MongoClientFactory
+from app.repositories.candidate_repository import CandidateRepository
+from app.repositories.job_repository import JobRepository
+from app.services.matching_service import (
+    embedding_batcher,
+    get_embedding_model,
+    get_shared_matching_service,
+)
+from app.services.rule_kernels import warm_up as warm_up_rule_kernels
 
 # Import routers
 from app.api.jobs import router as jobs_router
@@ -23,6 +32,12 @@ from app.api.parse_resume import router as resume_router
 from app.api.parse_job import router as parse_job_router
 from app.api.candidate_matches import router as candidate_matches_router
 
+# Startup progress, read by /readiness instead of re-checking each dependency
+_READY = {"db": False, "model": False}
+
+# Per-request access log (child of "app", so it follows LOG_LEVEL)
+access_logger = logging.getLogger("app.access")
+
 
 # ============================================================================
 # Logging Configuration
@@ -65,15 +80,31 @@ async def create_indexes():
 
         # Candidates indexes
         await db.candidates.create_index("email", unique=True, sparse=True)
-        await db.candidates.create_index("location")
+        # (location, created_at) also serves location-only lookups
+        await db.candidates.create_index([("location", 1), ("created_at", -1)])
         await db.candidates.create_index("created_at")
         await db.candidates.create_index([("salary_expectation", 1)])
+        await db.candidates.create_index([("updated_at", -1)])
 
         # Jobs indexes
-        await db.jobs.create_index("location")
+        # Equality fields first, then the created_at sort used by list queries
+        await db.jobs.create_index([("location", 1), ("created_at", -1)])
+        await db.jobs.create_index([("category", 1), ("experience_level", 1), ("created_at", -1)])
         await db.jobs.create_index("created_at")
         await db.jobs.create_index([("salary_min", 1), ("salary_max", 1)])
 
+        # Backs the filter queries pushed down by /matches/filter
+        await db.jobs.create_index([("location", 1), ("salary_min", 1), ("salary_max", 1)])
+        await db.jobs.create_index("requirements")
+        await db.jobs.create_index("advantages")
+        await db.jobs.create_index("skills_normalized")
+
+        # Full-text search over job postings
+        await db.jobs.create_index([("title", "text"), ("description", "text")])
+
+        # Embeddings cache: looked up by _id (the text hash), which is
+        # always indexed, so no extra index is needed.
+
         # Add status field index if you implement job status
         # await db.jobs.create_index("status")
 
@@ -84,6 +115,96 @@ async def create_indexes():
         # Don't fail startup, but log the error
 
 
+async def create_vector_search_index(dimensions: int):
+    """
+    Create the MongoDB vector search index over candidate embeddings
+    (Atlas or MongoDB 7+ only).
+    """
+    logger = logging.getLogger(__name__)
+
+    from pymongo.operations import SearchIndexModel
+
+    try:
+        db = MongoClientFactory.get_db()
+
+        existing = await db.candidates.list_search_indexes(settings.CANDIDATE_VECTOR_INDEX).to_list(length=1)
+        if existing:
+            return
+
+        await db.candidates.create_search_index(SearchIndexModel(
+            name=settings.CANDIDATE_VECTOR_INDEX,
+            type="vectorSearch",
+            definition={
+                "fields": [{
+                    "type": "vector",
+                    "path": "embedding",
+                    "numDimensions": dimensions,
+                    "similarity": "dotProduct",  # embeddings are L2-normalized
+                }]
+            },
+        ))
+        logger.info(f"Created vector search index {settings.CANDIDATE_VECTOR_INDEX}")
+
+    except Exception as e:
+        logger.error(f"Failed to create vector search index: {e}", exc_info=True)
+        # Recommendations fall back to scanning candidates
+
+
+# ============================================================================
+# Vector Indexes
+# ============================================================================
+
+async def build_job_vector_index(page_size: int = 1000):
+    """Encode all stored jobs into the job vector index."""
+    logger = logging.getLogger(__name__)
+
+    from app.services.vector_index import job_vector_index
+
+    try:
+        repo = JobRepository(MongoClientFactory.get_db())
+        matcher = get_shared_matching_service()
+
+        skip = 0
+        while True:
+            jobs = await repo.list(skip=skip, limit=page_size)
+            if not jobs:
+                break
+            await matcher.warm_job_embeddings(jobs)
+            await asyncio.to_thread(matcher.index_jobs, jobs)
+            skip += page_size
+
+        await asyncio.to_thread(job_vector_index.mark_ready)
+
+    except Exception as e:
+        # Matching falls back to a full scan while the index is not ready
+        logger.error(f"Failed to build job vector index: {e}", exc_info=True)
+
+
+async def build_candidate_vector_index(page_size: int = 1000):
+    """Load all candidate profile embeddings into the candidate vector index."""
+    logger = logging.getLogger(__name__)
+
+    from app.services.vector_index import candidate_vector_index
+
+    try:
+        repo = CandidateRepository(MongoClientFactory.get_db())
+        matcher = get_shared_matching_service()
+
+        skip = 0
+        while True:
+            candidates = await repo.list(skip=skip, limit=page_size)
+            if not candidates:
+                break
+            await asyncio.to_thread(matcher.index_candidates, candidates)
+            skip += page_size
+
+        await asyncio.to_thread(candidate_vector_index.mark_ready)
+
+    except Exception as e:
+        # Recommendations fall back to a scan while the index is not ready
+        logger.error(f"Failed to build candidate vector index: {e}", exc_info=True)
+
+
 # ============================================================================
 # Lifespan Context Manager
 # ============================================================================
@@ -103,14 +224,44 @@ async def lifespan(app: FastAPI):
         # Setup logging
         setup_logging()
 
+        # Connect to MongoDB (fails fast if it is unreachable)
+        app.state.mongo_client = await MongoClientFactory.connect()
+        _READY["db"] = True
+        logger.info("MongoDB connection established")
+
         # Create database indexes
         await create_indexes()
 
         # Warm up the embedding model (loads it into memory)
-        from app.services.matching_service import get_embedding_model
         model = get_embedding_model()
         logger.info(f"Embedding model loaded: {settings.EMBEDDING_MODEL}")
 
+        # Run one throwaway batch so lazy init (threads, allocator, kernels)
+        # happens now instead of on the first request
+        await asyncio.to_thread(
+            model.encode,
+            ["warmup"] * 8,
+            batch_size=8,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        logger.info(
+            f"Embedding model warmed up "
+            f"(device={model.device}, dim={model.get_sentence_embedding_dimension()})"
+        )
+        await asyncio.to_thread(warm_up_rule_kernels)
+        _READY["model"] = True
+
+        if settings.USE_VECTOR_SEARCH:
+            await create_vector_search_index(model.get_sentence_embedding_dimension())
+
+        # Populate the job and candidate ANN indexes in the background
+        if settings.USE_ANN_INDEX:
+            app.state.job_index_task = asyncio.create_task(build_job_vector_index())
+            if settings.USE_ANN_RECOMMENDATIONS:
+                app.state.candidate_index_task = asyncio.create_task(build_candidate_vector_index())
+
         logger.info(f"{settings.APP_NAME} startup complete")
 
     except Exception as e:
@@ -122,6 +273,15 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info(f"Shutting down {settings.APP_NAME}...")
 
+    # Stop the embedding batcher
+    await embedding_batcher.close()
+
+    # Close outbound HTTP clients
+    from app.services.ollama_client import close_ollama_client
+    from app.services.ai_resume_parser import close_nominatim_client
+    await close_ollama_client()
+    await close_nominatim_client()
+
     # Close MongoDB connection
     try:
         client = MongoClientFactory.get_client()
@@ -145,6 +305,7 @@ app = FastAPI(
     title=settings.APP_NAME,
     version="2.0.0",
     description="AI-powered job matching system with semantic similarity",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -211,17 +372,21 @@ app.add_middleware(
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log all incoming requests."""
-    logger = logging.getLogger(__name__)
-
-    # Log request
-    logger.info(f"{request.method} {request.url.path}")
+    """Log each request once it completes, with status and duration."""
+    # Skip timing and formatting entirely when access logs are off
+    if not access_logger.isEnabledFor(logging.INFO):
+        return await call_next(request)
 
-    # Process request
+    start = time.perf_counter()
     response = await call_next(request)
 
-    # Log response status
-    logger.info(f"{request.method} {request.url.path} - {response.status_code}")
+    access_logger.info(
+        "%s %s - %d (%.2fms)",
+        request.method,
+        request.url.path,
+        response.status_code,
+        (time.perf_counter() - start) * 1000
+    )
 
     return response
 
@@ -261,13 +426,12 @@ async def readiness_check():
     logger = logging.getLogger(__name__)
 
     try:
-        # Check MongoDB connection
-        db = MongoClientFactory.get_db()
-        await db.command("ping")
+        if not (_READY["db"] and _READY["model"]):
+            raise RuntimeError("startup not complete")
 
-        # Check if embedding model is loaded
-        from app.services.matching_service import get_embedding_model
-        model = get_embedding_model()
+        # The model can't become unloaded once warmed up; only MongoDB is re-checked
+        db = MongoClientFactory.get_db()
+        await asyncio.wait_for(db.command("ping"), timeout=1.0)
 
         return {
             "status": "ready",
@@ -286,6 +450,18 @@ async def readiness_check():
         )
 
 
+@app.get("/stats")
+async def cache_stats():
+    """Embedding and match cache statistics."""
+    from app.services.semantic_cache import match_result_cache, recommendation_cache
+
+    return {
+        "embeddings": get_shared_matching_service().get_cache_stats(),
+        "match_results": match_result_cache.stats(),
+        "recommendations": recommendation_cache.stats()
+    }
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -299,4 +475,5 @@ async def root():
 
 # ============================================================================
 # Run with: uvicorn app.main:app --reload
+# Production: uvicorn app.main:app --loop uvloop --http httptools
 # ============================================================================
\ No newline at end of file
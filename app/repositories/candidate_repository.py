@@ -1,74 +1,209 @@
+import asyncio
+import logging
 from typing import List, Optional, Dict, Any
-from datetime import datetime
 from bson import ObjectId
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorGridFSBucket, AsyncIOMotorGridOut
+from app.db.mongo import utc_now
 from app.domain.models import CandidateCreate, CandidateUpdate, CandidateDB
+from app.services.matching_service import get_shared_matching_service
+from app.services.semantic_cache import recommendation_cache
+from app.services.vector_index import candidate_vector_index
 
 
-def _serialize_id(doc) -> dict:
-    doc["id"] = str(doc["_id"])
-    del doc["_id"]
-    # Remove resume_file if present (shouldn't be queried, but just in case)
-    doc.pop("resume_file", None)
-    return doc
+logger = logging.getLogger(__name__)
+
+
+# Default projection for bulk reads: matching never needs the resume bytes,
+# which are fetched separately through get_resume_fields.
+# (resume_file only exists on candidates stored before resumes moved to GridFS.)
+MATCH_PROJECTION: Dict[str, int] = {"resume_file": 0}
+
+# Fields that feed the stored profile embedding
+EMBEDDING_FIELDS = frozenset({"name", "location", "education", "experience", "languages", "skills"})
+
+
+def _to_model_dict(doc) -> dict:
+    # resume_file is excluded by every read projection; resume_file_id and
+    # other storage-only fields are ignored by CandidateDB
+    return {"id": str(doc.pop("_id")), **doc}
+
+
+def _construct_candidates(docs: List[dict]) -> List[CandidateDB]:
+    return [CandidateDB.model_construct(**_to_model_dict(d)) for d in docs]
 
 
 class CandidateRepository:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.collection = db["candidates"]
+        # Resume files live in GridFS so they can be streamed in chunks
+        self.resumes = AsyncIOMotorGridFSBucket(db, bucket_name="resumes")
+
+    async def _upload_resume(self, filename: Optional[str], content_type: Optional[str], content: bytes) -> ObjectId:
+        return await self.resumes.upload_from_stream(
+            filename or "resume",
+            content,
+            metadata={"content_type": content_type}
+        )
+
+    async def _compute_embedding(self, candidate: CandidateCreate) -> Optional[List[float]]:
+        """Encode the candidate profile (None on failure)."""
+        try:
+            return await get_shared_matching_service().encode_candidate(candidate)
+        except Exception as e:
+            # Matching falls back to encoding on demand
+            logger.warning(f"Failed to compute candidate embedding: {e}")
+            return None
+
+    @staticmethod
+    def _index(cand: CandidateDB) -> None:
+        # Only stored embeddings are indexed here (no model call on the request path);
+        # the startup build encodes any candidate still missing one
+        if cand.embedding:
+            get_shared_matching_service().index_candidates([cand])
 
     async def create(self, data: CandidateCreate, resume_file: bytes = None) -> CandidateDB:
-        now = datetime.utcnow()
+        now = utc_now()
         doc = data.model_dump()
+        doc["embedding"] = await self._compute_embedding(data)
 
         # Add resume file if provided
         if resume_file:
-            doc["resume_file"] = resume_file
+            doc["resume_file_id"] = await self._upload_resume(
+                data.resume_filename, data.resume_content_type, resume_file
+            )
 
         doc.update({"created_at": now, "updated_at": now})
         res = await self.collection.insert_one(doc)
+        recommendation_cache.invalidate()
 
-        # Fetch without resume_file
-        saved = await self.collection.find_one(
-            {"_id": res.inserted_id},
-            {"resume_file": 0}  # Exclude binary field
-        )
-        return CandidateDB(**_serialize_id(saved))
+        # The inserted document is already in memory; no need to read it back
+        doc["_id"] = res.inserted_id
+        cand = CandidateDB(**_to_model_dict(doc))
+        self._index(cand)
+        return cand
 
     async def get(self, cand_id: str) -> Optional[CandidateDB]:
         doc = await self.collection.find_one(
             {"_id": ObjectId(cand_id)},
             {"resume_file": 0}  # Exclude binary field
         )
-        return CandidateDB(**_serialize_id(doc)) if doc else None
+        return CandidateDB(**_to_model_dict(doc)) if doc else None
 
-    async def list(self, skip: int = 0, limit: int = 50) -> List[CandidateDB]:
+    async def list(
+            self,
+            skip: int = 0,
+            limit: int = 50,
+            projection: Optional[Dict[str, int]] = None
+    ) -> List[CandidateDB]:
         cursor = self.collection.find(
             {},
-            {"resume_file": 0}  # Exclude binary field
+            projection or MATCH_PROJECTION
         ).skip(skip).limit(limit).sort("created_at", -1)
-        return [CandidateDB(**_serialize_id(d)) async for d in cursor]
+        docs = await cursor.to_list(length=limit)
+        # Stored documents were validated on write; skip re-validating bulk reads.
+        # Building the models is still O(n) Python work, so keep it off the event loop.
+        return await asyncio.to_thread(_construct_candidates, docs)
+
+    async def list_by_ids(self, cand_ids: List[str]) -> List[CandidateDB]:
+        cursor = self.collection.find({"_id": {"$in": [ObjectId(i) for i in cand_ids]}}, MATCH_PROJECTION)
+        docs = await cursor.to_list(length=len(cand_ids))
+        return await asyncio.to_thread(_construct_candidates, docs)
+
+    async def vector_search(
+            self,
+            query_vector: List[float],
+            limit: int,
+            num_candidates: int,
+            index_name: str
+    ) -> List[CandidateDB]:
+        """
+        Find the candidates whose stored embedding is closest to `query_vector`
+        using a MongoDB vector search index on `embedding`.
+        """
+        pipeline = [
+            {
+                "$vectorSearch": {
+                    "index": index_name,
+                    "path": "embedding",
+                    "queryVector": query_vector,
+                    "numCandidates": num_candidates,
+                    "limit": limit,
+                }
+            },
+            {"$project": MATCH_PROJECTION},
+        ]
+        docs = await self.collection.aggregate(pipeline).to_list(length=limit)
+        return await asyncio.to_thread(_construct_candidates, docs)
 
     async def update(self, cand_id: str, data: CandidateUpdate) -> Optional[CandidateDB]:
-        update_doc = {k: v for k, v in data.model_dump(exclude_none=True).items()}
-        update_doc["updated_at"] = datetime.utcnow()
+        # Only fields the client actually sent end up in $set
+        update_doc = data.model_dump(exclude_none=True, exclude_unset=True)
+        update_doc["updated_at"] = utc_now()
         await self.collection.update_one({"_id": ObjectId(cand_id)}, {"$set": update_doc})
-        return await self.get(cand_id)
+        recommendation_cache.invalidate()
+        cand = await self.get(cand_id)
+
+        # Re-encode the profile only when its text changed
+        if cand and EMBEDDING_FIELDS.intersection(update_doc):
+            embedding = await self._compute_embedding(cand)
+            await self.collection.update_one({"_id": ObjectId(cand_id)}, {"$set": {"embedding": embedding}})
+            cand = cand.model_copy(update={"embedding": embedding})
+            self._index(cand)
+
+        return cand
 
     async def delete(self, cand_id: str) -> bool:
-        res = await self.collection.delete_one({"_id": ObjectId(cand_id)})
-        return res.deleted_count == 1
+        doc = await self.collection.find_one_and_delete(
+            {"_id": ObjectId(cand_id)},
+            {"resume_file_id": 1}
+        )
+        if doc and doc.get("resume_file_id"):
+            await self.resumes.delete(doc["resume_file_id"])
+        candidate_vector_index.remove(cand_id)
+        recommendation_cache.invalidate()
+        return doc is not None
 
     async def get_resume_fields(self, cand_id: str) -> Optional[Dict[str, Any]]:
         doc = await self.collection.find_one(
             {"_id": ObjectId(cand_id)},
-            {"resume_file": 1, "resume_filename": 1, "resume_content_type": 1}
+            {"resume_file": 1, "resume_file_id": 1, "resume_filename": 1, "resume_content_type": 1}
         )
         if not doc:
             return None
 
         return {
             "resume_file": doc.get("resume_file"),
+            "resume_file_id": doc.get("resume_file_id"),
             "resume_filename": doc.get("resume_filename"),
             "resume_content_type": doc.get("resume_content_type"),
-        }
\ No newline at end of file
+        }
+
+    async def open_resume_stream(self, file_id: ObjectId) -> AsyncIOMotorGridOut:
+        return await self.resumes.open_download_stream(file_id)
+
+    async def save_resume(
+            self,
+            cand_id: str,
+            filename: Optional[str],
+            content_type: Optional[str],
+            content: bytes
+    ) -> None:
+        """Store a new resume in GridFS and replace the candidate's previous one."""
+        file_id = await self._upload_resume(filename, content_type, content)
+
+        previous = await self.collection.find_one_and_update(
+            {"_id": ObjectId(cand_id)},
+            {
+                "$set": {
+                    "resume_file_id": file_id,
+                    "resume_filename": filename,
+                    "resume_content_type": content_type,
+                    "updated_at": utc_now(),
+                },
+                "$unset": {"resume_file": ""},
+            },
+            projection={"resume_file_id": 1}
+        )
+
+        if previous and previous.get("resume_file_id"):
+            await self.resumes.delete(previous["resume_file_id"])
\ No newline at end of file
@@ -1,40 +1,102 @@
-from typing import List, Optional
-from datetime import datetime
+import asyncio
+from typing import Any, Dict, List, Optional
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from app.domain.models import JobCreate, JobUpdate, JobDB
+from pydantic import TypeAdapter
+from app.db.mongo import utc_now
+from app.domain.models import JobCreate, JobUpdate, JobDB, JobSummary
+from app.services.embedding_cache import job_embedding_cache
+from app.services.semantic_cache import match_result_cache
+from app.services.vector_index import job_vector_index
+
+# Only the fields JobSummary needs are read for list views
+SUMMARY_PROJECTION: Dict[str, int] = {
+    "title": 1, "location": 1, "salary_min": 1, "salary_max": 1, "created_at": 1, "updated_at": 1
+}
+
+_SUMMARY_ADAPTER = TypeAdapter(List[JobSummary])
 
 def _serialize_id(doc) -> dict:
     doc["id"] = str(doc["_id"])
     del doc["_id"]
     return doc
 
+def _construct_jobs(docs: List[dict]) -> List[JobDB]:
+    return [JobDB.model_construct(**_serialize_id(d)) for d in docs]
+
+def normalize_skills(requirements: List[str], advantages: List[str]) -> List[str]:
+    """Lowercased, de-duplicated requirements + advantages (stored as `skills_normalized`)."""
+    return list(dict.fromkeys(s.lower() for s in requirements + advantages))
+
 class JobRepository:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.collection = db["jobs"]
 
     async def create(self, data: JobCreate) -> JobDB:
-        now = datetime.utcnow()
+        now = utc_now()
         doc = data.model_dump()
+        doc["skills_normalized"] = normalize_skills(doc["requirements"], doc["advantages"])
         doc.update({"created_at": now, "updated_at": now})
         res = await self.collection.insert_one(doc)
-        saved = await self.collection.find_one({"_id": res.inserted_id})
-        return JobDB(**_serialize_id(saved))
+        match_result_cache.invalidate()
+        # The inserted document is already in memory; no need to read it back
+        doc["_id"] = res.inserted_id
+        return JobDB(**_serialize_id(doc))
 
     async def get(self, job_id: str) -> Optional[JobDB]:
         doc = await self.collection.find_one({"_id": ObjectId(job_id)})
         return JobDB(**_serialize_id(doc)) if doc else None
 
-    async def list(self, skip: int = 0, limit: int = 50) -> List[JobDB]:
-        cursor = self.collection.find().skip(skip).limit(limit).sort("created_at", -1)
-        return [JobDB(**_serialize_id(d)) async for d in cursor]
+    async def list(
+            self,
+            skip: int = 0,
+            limit: int = 50,
+            query: Optional[Dict[str, Any]] = None,
+            projection: Optional[Dict[str, int]] = None
+    ) -> List[JobDB]:
+        cursor = self.collection.find(query or {}, projection).skip(skip).limit(limit).sort("created_at", -1)
+        docs = await cursor.to_list(length=limit)
+        # Stored documents were validated on write; skip re-validating bulk reads.
+        # Building the models is still O(n) Python work, so keep it off the event loop.
+        return await asyncio.to_thread(_construct_jobs, docs)
+
+    async def list_summaries(self, skip: int = 0, limit: int = 50) -> List[JobSummary]:
+        cursor = self.collection.find({}, SUMMARY_PROJECTION).skip(skip).limit(limit).sort("created_at", -1)
+        docs = [_serialize_id(d) for d in await cursor.to_list(length=limit)]
+        return await asyncio.to_thread(_SUMMARY_ADAPTER.validate_python, docs)
+
+    async def list_by_ids(self, job_ids: List[str]) -> List[JobDB]:
+        cursor = self.collection.find({"_id": {"$in": [ObjectId(i) for i in job_ids]}})
+        docs = await cursor.to_list(length=len(job_ids))
+        return await asyncio.to_thread(_construct_jobs, docs)
+
+    async def count(self) -> int:
+        return await self.collection.estimated_document_count()
 
     async def update(self, job_id: str, data: JobUpdate) -> Optional[JobDB]:
-        update_doc = {k: v for k, v in data.model_dump(exclude_none=True).items()}
-        update_doc["updated_at"] = datetime.utcnow()
+        # Only fields the client actually sent end up in $set
+        update_doc = data.model_dump(exclude_none=True, exclude_unset=True)
+        update_doc["updated_at"] = utc_now()
+
+        # Keep skills_normalized in sync when either source list changes
+        if "requirements" in update_doc or "advantages" in update_doc:
+            current = await self.collection.find_one(
+                {"_id": ObjectId(job_id)},
+                {"requirements": 1, "advantages": 1}
+            ) or {}
+            update_doc["skills_normalized"] = normalize_skills(
+                update_doc.get("requirements", current.get("requirements", [])),
+                update_doc.get("advantages", current.get("advantages", []))
+            )
+
         await self.collection.update_one({"_id": ObjectId(job_id)}, {"$set": update_doc})
+        job_embedding_cache.invalidate(job_id)
+        match_result_cache.invalidate()
         return await self.get(job_id)
 
     async def delete(self, job_id: str) -> bool:
         res = await self.collection.delete_one({"_id": ObjectId(job_id)})
+        job_embedding_cache.invalidate(job_id)
+        job_vector_index.remove(job_id)
+        match_result_cache.invalidate()
         return res.deleted_count == 1
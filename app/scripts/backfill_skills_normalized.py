@@ -0,0 +1,47 @@
+# scripts/backfill_skills_normalized.py
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+from app.config import settings
+from app.repositories.job_repository import normalize_skills
+
+
+async def backfill_skills_normalized():
+    """Populate skills_normalized on jobs created before the field existed."""
+
+    # Connect to MongoDB
+    client = AsyncIOMotorClient(settings.MONGODB_URI)
+    db = client[settings.MONGODB_DB]
+
+    print("🔍 Searching for jobs without skills_normalized...\n")
+
+    cursor = db.jobs.find(
+        {"skills_normalized": {"$exists": False}},
+        {"requirements": 1, "advantages": 1}
+    )
+
+    updates = [
+        UpdateOne(
+            {"_id": job["_id"]},
+            {"$set": {"skills_normalized": normalize_skills(
+                job.get("requirements") or [],
+                job.get("advantages") or []
+            )}}
+        )
+        async for job in cursor
+    ]
+
+    if not updates:
+        print("✅ All jobs already have skills_normalized!")
+        client.close()
+        return
+
+    result = await db.jobs.bulk_write(updates, ordered=False)
+    print(f"🎉 Updated {result.modified_count} job(s)")
+
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_skills_normalized())
@@ -24,34 +24,35 @@ async def find_and_clean_duplicates():
         {"$match": {"count": {"$gt": 1}}}
     ]
 
-    duplicates = await db.candidates.aggregate(pipeline).to_list(None)
+    # Stream groups instead of loading them all; only the ids to delete are kept
+    ids_to_delete = []
+    duplicate_count = 0
 
-    if not duplicates:
-        print("✅ No duplicate emails found!")
-        return
+    async for dup in db.candidates.aggregate(pipeline).batch_size(1000):
+        if duplicate_count == 0:
+            print("⚠️  Found duplicate email(s):\n")
+        duplicate_count += 1
 
-    print(f"⚠️  Found {len(duplicates)} duplicate email(s):\n")
-
-    for dup in duplicates:
         print(f"📧 Email: {dup['_id']}")
         print(f"   Count: {dup['count']} candidates")
         print(f"   Names: {', '.join(dup['names'])}")
         print(f"   IDs: {[str(id) for id in dup['ids']]}\n")
 
+        ids_to_delete.extend(dup['ids'][1:])  # Keep first, delete rest
+
+    if not duplicate_count:
+        print("✅ No duplicate emails found!")
+        return
+
+    print(f"⚠️  {duplicate_count} duplicate email(s), {len(ids_to_delete)} candidate(s) to delete\n")
+
     # Ask for confirmation
     response = input("Do you want to delete duplicates (keep first, delete rest)? (y/n): ")
 
     if response.lower() == 'y':
-        total_deleted = 0
-        for dup in duplicates:
-            ids_to_delete = dup['ids'][1:]  # Keep first, delete rest
-            if ids_to_delete:
-                result = await db.candidates.delete_many({"_id": {"$in": ids_to_delete}})
-                deleted_count = result.deleted_count
-                total_deleted += deleted_count
-                print(f"✅ Deleted {deleted_count} duplicate(s) for {dup['_id']}")
-
-        print(f"\n🎉 Total deleted: {total_deleted} candidate(s)")
+        # One round-trip for all groups
+        result = await db.candidates.delete_many({"_id": {"$in": ids_to_delete}})
+        print(f"\n🎉 Total deleted: {result.deleted_count} candidate(s)")
     else:
         print("❌ Cancelled. No changes made.")
 
@@ -1,23 +1,17 @@
-import json
 import re
-import subprocess
+import orjson
 from typing import Dict, Any
 
+from app.services.ollama_client import generate_json
+
 
 # ======================================================
-# Run Ollama (Windows safe, sync)
+# Run Ollama (HTTP API, async)
 # ======================================================
 
-def run_ollama(prompt: str, model: str = "qwen2.5:1.5b", timeout: int = 120) -> str:
+async def run_ollama(prompt: str, model: str = "qwen2.5:1.5b", timeout: int = 120) -> str:
     try:
-        result = subprocess.run(
-            ["ollama", "run", model],
-            input=prompt.encode("utf-8"),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            timeout=timeout,
-        )
-        return result.stdout.decode("utf-8", errors="ignore")
+        return await generate_json(prompt, model=model, timeout=timeout)
     except Exception:
         return ""
 
@@ -26,12 +20,16 @@ def run_ollama(prompt: str, model: str = "qwen2.5:1.5b", timeout: int = 120) ->
 # Extract JSON safely
 # ======================================================
 
+FENCE_RE = re.compile(r"```(?:json)?")
+OBJ_RE = re.compile(r"\{[\s\S]*\}")
+
+
 def extract_json(text: str) -> dict:
-    text = re.sub(r"```json|```", "", text).strip()
-    match = re.search(r"\{[\s\S]*\}", text)
+    text = FENCE_RE.sub("", text).strip()
+    match = OBJ_RE.search(text)
     if not match:
         raise ValueError("No JSON found")
-    return json.loads(match.group(0))
+    return orjson.loads(match.group(0))
 
 
 # ======================================================
@@ -52,12 +50,8 @@ def normalize_job(data: Dict[str, Any]) -> dict:
     }
 
 
-# ======================================================
-# Main job parsing function
-# ======================================================
-
-async def parse_job_text(text: str) -> dict:
-    prompt = f"""
+# Prompt is concatenated around the input, so the input is never re-templated
+_JOB_PROMPT_PREFIX = """
 You are a STRICT job description parser.
 
 Extract ONLY information explicitly present.
@@ -66,7 +60,7 @@ If a field is missing → return empty string or null.
 Return VALID JSON ONLY.
 
 FORMAT:
-{{
+{
   "title": "",
   "location": "",
   "salary_min": null,
@@ -76,13 +70,21 @@ FORMAT:
   "skills": [],
   "languages": [],
   "description": ""
-}}
+}
 
 Job description:
-\"\"\"{text}\"\"\"
-"""
+\"\"\""""
+_JOB_PROMPT_SUFFIX = '"""\n'
+
+
+# ======================================================
+# Main job parsing function
+# ======================================================
+
+async def parse_job_text(text: str) -> dict:
+    prompt = _JOB_PROMPT_PREFIX + text + _JOB_PROMPT_SUFFIX
 
-    raw = run_ollama(prompt)
+    raw = await run_ollama(prompt)
     if not raw.strip():
         raise ValueError("Empty model output")
 
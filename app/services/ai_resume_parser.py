@@ -1,25 +1,20 @@
-import json
+import asyncio
 import re
-import subprocess
-import requests
-from typing import Dict, Any, List
+import httpx
+import orjson
+from collections import defaultdict
+from typing import Dict, Any, DefaultDict, List, Optional
+
+from app.services.ollama_client import generate_json
 
 
 # ==========================================================
-# 1. Run Ollama (Windows-safe, synchronous)
+# 1. Run Ollama (HTTP API, async)
 # ==========================================================
 
-def run_ollama(prompt: str, model: str = "qwen2.5:1.5b", timeout: int = 240) -> str:
+async def run_ollama(prompt: str, model: str = "qwen2.5:1.5b", timeout: int = 240) -> str:
     try:
-        result = subprocess.run(
-            ["ollama", "run", model],
-            input=prompt.encode("utf-8"),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            timeout=timeout,
-        )
-
-        output = result.stdout.decode("utf-8", errors="ignore")
+        output = await generate_json(prompt, model=model, timeout=timeout)
 
         print("\n=========== RAW OLLAMA OUTPUT ===========")
         print(output)
@@ -27,7 +22,7 @@ def run_ollama(prompt: str, model: str = "qwen2.5:1.5b", timeout: int = 240) ->
 
         return output
 
-    except subprocess.TimeoutExpired:
+    except httpx.TimeoutException:
         print("OLLAMA ERROR: TIMED OUT")
         return ""
 
@@ -36,23 +31,27 @@ def run_ollama(prompt: str, model: str = "qwen2.5:1.5b", timeout: int = 240) ->
 # 2. Robust JSON extraction
 # ==========================================================
 
+FENCE_RE = re.compile(r"```(?:json)?")
+OBJ_RE = re.compile(r"\{[\s\S]*\}")
+TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+
+
 def try_extract_json(text: str) -> dict:
     if not text.strip():
         raise ValueError("Empty model output")
 
     # Remove markdown fences
-    text = re.sub(r"```json|```", "", text).strip()
+    text = FENCE_RE.sub("", text).strip()
 
     try:
-        return json.loads(text)
-    except:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
         pass
 
-    match = re.search(r"\{[\s\S]*\}", text)
+    match = OBJ_RE.search(text)
     if match:
-        block = match.group(0)
-        block = re.sub(r",(\s*[}\]])", r"\1", block)  # remove trailing commas
-        return json.loads(block)
+        block = TRAILING_COMMA_RE.sub(r"\1", match.group(0))  # remove trailing commas
+        return orjson.loads(block)
 
     raise ValueError("No valid JSON found")
 
@@ -139,13 +138,32 @@ SKILL_KEYWORDS = {
     "html", "css"
 }
 
+
+def _build_skill_automaton():
+    # Requires: pip install pyahocorasick
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for skill in SKILL_KEYWORDS:
+        automaton.add_word(skill, skill)
+    automaton.make_automaton()
+    return automaton
+
+
+# Matches every keyword in a single pass over the text (None if not installed)
+SKILL_AUTOMATON = _build_skill_automaton()
+
+
 def extract_skills(text: str) -> List[str]:
     text_lower = text.lower()
-    found = set()
 
-    for skill in SKILL_KEYWORDS:
-        if skill in text_lower:
-            found.add(skill.title())
+    if SKILL_AUTOMATON is not None:
+        found = {skill.title() for _, skill in SKILL_AUTOMATON.iter(text_lower)}
+    else:
+        found = {skill.title() for skill in SKILL_KEYWORDS if skill in text_lower}
 
     return sorted(found)
 
@@ -154,84 +172,143 @@ def extract_skills(text: str) -> List[str]:
 # 5. Location extraction + region enrichment
 # ==========================================================
 
+KNOWN_CITIES = ("Kiryat Ata", "Haifa", "Tel Aviv", "Jerusalem", "Petach Tikva", "Ramat Yishai")
+
+# Longest names first so a city is never cut short by a shorter prefix
+CITY_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(c) for c in sorted(KNOWN_CITIES, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE
+)
+
+
 def extract_city(text: str) -> str:
-    match = re.search(
-        r"\b(Kiryat Ata|Haifa|Tel Aviv|Jerusalem|Petach Tikva|Ramat Yishai)\b",
-        text,
-        re.IGNORECASE
-    )
+    match = CITY_RE.search(text)
     return match.group(0) if match else ""
 
 
-async def enrich_location_with_region(city: str) -> str:
-    try:
-        r = requests.get(
-            "https://nominatim.openstreetmap.org/search",
-            params={
-                "q": city,
-                "format": "json",
-                "addressdetails": 1,
-                "limit": 1,
-                "accept-language": "en"
-            },
+_nominatim: Optional[httpx.AsyncClient] = None
+
+# city -> "city, region"; concurrent misses for one city share a single lookup
+_CITY_CACHE: Dict[str, str] = {}
+_CITY_LOCKS: DefaultDict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+def _get_nominatim_client() -> httpx.AsyncClient:
+    global _nominatim
+    if _nominatim is None:
+        _nominatim = httpx.AsyncClient(
+            base_url="https://nominatim.openstreetmap.org",
             headers={"User-Agent": "JobMatcher/1.0"},
-            timeout=10
+            timeout=10,
+            limits=httpx.Limits(max_keepalive_connections=4)
         )
+    return _nominatim
 
-        data = r.json()
-        if not data:
-            return city
 
-        address = data[0].get("address", {})
-        region = (
-            address.get("state") or
-            address.get("county") or
-            address.get("region")
-        )
+async def close_nominatim_client() -> None:
+    global _nominatim
+    if _nominatim is not None:
+        await _nominatim.aclose()
+        _nominatim = None
 
-        return f"{city}, {region}" if region else city
 
-    except Exception:
-        return city
+async def enrich_location_with_region(city: str) -> str:
+    key = city.lower()
+    cached = _CITY_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    async with _CITY_LOCKS[key]:
+        # Another request may have filled it while we waited
+        cached = _CITY_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            r = await _get_nominatim_client().get(
+                "/search",
+                params={
+                    "q": city,
+                    "format": "json",
+                    "addressdetails": 1,
+                    "limit": 1,
+                    "accept-language": "en"
+                }
+            )
+
+            data = r.json()
+            if not data:
+                location = city
+            else:
+                address = data[0].get("address", {})
+                region = (
+                    address.get("state") or
+                    address.get("county") or
+                    address.get("region")
+                )
+                location = f"{city}, {region}" if region else city
+
+        except Exception:
+            # Don't cache failures; the next resume retries the lookup
+            return city
 
+        _CITY_CACHE[key] = location
+        return location
 
-# ==========================================================
-# 6. Main parsing function (FINAL)
-# ==========================================================
 
-async def parse_resume_text(resume_text: str) -> dict:
-    prompt = f"""
+# Prompt is concatenated around the input, so the input is never re-templated
+_RESUME_PROMPT_PREFIX = """
 You are a STRICT resume parser.
 Extract ONLY facts present in the text.
 Return VALID JSON ONLY.
 
 JSON FORMAT:
-{{
+{
   "name": "",
   "location": "",
   "email": "",
   "phone": "",
   "year_of_birth": "",
-  "education": [{{"title":"","institution":"","dates":""}}],
+  "education": [{"title":"","institution":"","dates":""}],
   "salary_expectation": "",
-  "experience": [{{"company":"","position":"","dates":""}}],
-  "languages": [{{"name":"","proficiency":""}}]
-}}
+  "experience": [{"company":"","position":"","dates":""}],
+  "languages": [{"name":"","proficiency":""}]
+}
 
 Resume text:
-\"\"\"{resume_text}\"\"\"
-"""
+\"\"\""""
+_RESUME_PROMPT_SUFFIX = '"""\n'
+
+
+# ==========================================================
+# 6. Main parsing function (FINAL)
+# ==========================================================
+
+async def _resolve_location(resume_text: str) -> str:
+    """Find a known city in the text and enrich it with its region ("" if none)."""
+    city = await asyncio.to_thread(extract_city, resume_text)
+    return await enrich_location_with_region(city) if city else ""
+
+
+async def parse_resume_text(resume_text: str) -> dict:
+    prompt = _RESUME_PROMPT_PREFIX + resume_text + _RESUME_PROMPT_SUFFIX
+
+    # The deterministic fields only need the raw text, so they are resolved
+    # while the LLM is generating (text scans run in worker threads)
+    raw, location, skills = await asyncio.gather(
+        run_ollama(prompt),
+        _resolve_location(resume_text),
+        asyncio.to_thread(extract_skills, resume_text),
+    )
 
-    raw = run_ollama(prompt)
     data = try_extract_json(raw)
     result = normalize_result(data)
 
     # 🔒 Override hallucination-prone fields
-    city = extract_city(resume_text)
-    if city:
-        result["location"] = await enrich_location_with_region(city)
+    if location:
+        result["location"] = location
 
     # 🧠 Deterministic skills
-    result["skills"] = extract_skills(resume_text)
+    result["skills"] = skills
 
     return result
@@ -0,0 +1,70 @@
+"""
+Columnar (structure-of-arrays) view of a candidate list for batch scoring.
+
+Batch scorers read one contiguous array per field instead of following
+attributes on N candidate objects. A pool is built once per candidate
+list and reused for every job scored against it.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from app.domain.models import CandidateDB
+from app.services import rule_kernels
+
+
+@dataclass(frozen=True)
+class CandidatePool:
+    """Candidate fields used by the batch scorers, one array entry per candidate."""
+    candidates: List[CandidateDB]
+    salary: np.ndarray  # float64 salary_expectation
+    shift_ok: np.ndarray  # bool
+    weekend_ok: np.ndarray  # bool
+    cert_mask: np.ndarray  # uint64 (object when the vocabulary exceeds 64)
+    emb: Optional[np.ndarray] = None  # float16/float32 (N, dim), L2-normalized
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def take(self, indices: np.ndarray) -> "CandidatePool":
+        """Sub-pool of the candidates at `indices`, in that order."""
+        return CandidatePool(
+            candidates=[self.candidates[i] for i in indices],
+            salary=self.salary[indices],
+            shift_ok=self.shift_ok[indices],
+            weekend_ok=self.weekend_ok[indices],
+            cert_mask=self.cert_mask[indices],
+            emb=None if self.emb is None else self.emb[indices],
+        )
+
+    @classmethod
+    def from_db(
+            cls,
+            candidates: List[CandidateDB],
+            embeddings: Optional[np.ndarray] = None
+    ) -> "CandidatePool":
+        """
+        Pack candidates column by column.
+
+        Args:
+            embeddings: Optional profile embeddings aligned with `candidates`
+        """
+        n = len(candidates)
+        return cls(
+            candidates=candidates,
+            salary=np.fromiter(
+                (c.salary_expectation for c in candidates), dtype=np.float64, count=n
+            ),
+            shift_ok=np.fromiter(
+                (c.willing_to_work_shifts for c in candidates), dtype=np.bool_, count=n
+            ),
+            weekend_ok=np.fromiter(
+                (c.willing_to_work_weekends for c in candidates), dtype=np.bool_, count=n
+            ),
+            cert_mask=rule_kernels.pack_certification_masks(
+                [rule_kernels.certification_mask(c.certifications_lower) for c in candidates]
+            ),
+            emb=None if embeddings is None else np.asarray(embeddings, dtype=np.float16),
+        )
@@ -1,131 +1,214 @@
-from typing import Dict, Tuple
-from app.domain.models import JobDB, CandidateDB, JobCategory
-
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
 
-class CategoryMatchingStrategy:
-    """
-    Different scoring strategies for different job categories.
-    Tech jobs focus on skills, while service jobs focus on availability.
-    """
+import numpy as np
 
-    def __init__(self, job: JobDB, candidate: CandidateDB):
-        self.job = job
-        self.candidate = candidate
-        self.category = job.category
-
-    def get_scoring_weights(self) -> Dict[str, float]:
-        """Return scoring weights based on job category."""
-
-        weights = {
-            JobCategory.TECHNOLOGY: {
-                "skills": 0.40,
-                "experience": 0.25,
-                "education": 0.20,
-                "languages": 0.10,
-                "availability": 0.05,
-            },
-            JobCategory.RETAIL: {
-                "skills": 0.15,
-                "experience": 0.20,
-                "education": 0.05,
-                "languages": 0.20,
-                "availability": 0.40,  # Very important for retail
-            },
-            JobCategory.HOSPITALITY: {
-                "skills": 0.15,
-                "experience": 0.20,
-                "education": 0.05,
-                "languages": 0.30,  # Crucial for hotels/restaurants
-                "availability": 0.30,
-            },
-            JobCategory.HEALTHCARE: {
-                "skills": 0.25,
-                "experience": 0.25,
-                "education": 0.20,
-                "languages": 0.15,
-                "availability": 0.15,
-                "certifications": 0.30,  # NEW: Very important
-            },
-            JobCategory.MANUFACTURING: {
-                "skills": 0.25,
-                "experience": 0.30,
-                "education": 0.05,
-                "languages": 0.05,
-                "availability": 0.25,
-                "certifications": 0.10,
-            },
-            JobCategory.CUSTOMER_SERVICE: {
-                "skills": 0.20,
-                "experience": 0.20,
-                "education": 0.10,
-                "languages": 0.35,  # Very important
-                "availability": 0.15,
-            },
-        }
-
-        # Default for other categories
-        default_weights = {
-            "skills": 0.25,
-            "experience": 0.25,
-            "education": 0.15,
-            "languages": 0.15,
-            "availability": 0.15,
-            "certifications": 0.05,
-        }
-
-        return weights.get(self.category, default_weights)
-
-    def score_availability(self) -> Tuple[float, str]:
-        """Score based on shift/weekend availability."""
-        score = 0.0
-        reasons = []
-
-        # Shift work
-        if self.job.shift_work:
-            if self.candidate.willing_to_work_shifts:
-                score += 0.5
-                reasons.append("✅ Willing to work shifts")
-            else:
-                reasons.append("⚠️ Not willing to work shifts (required)")
-                return 0.0, " | ".join(reasons)  # Hard filter
+from app.domain.models import JobDB, CandidateDB, JobCategory
+from app.services import rule_kernels
+from app.services.candidate_pool import CandidatePool
+
+
+# Scoring weights per job category (read-only)
+_WEIGHTS: Mapping[JobCategory, Mapping[str, float]] = MappingProxyType({
+    JobCategory.TECHNOLOGY: MappingProxyType({
+        "skills": 0.40,
+        "experience": 0.25,
+        "education": 0.20,
+        "languages": 0.10,
+        "availability": 0.05,
+    }),
+    JobCategory.RETAIL: MappingProxyType({
+        "skills": 0.15,
+        "experience": 0.20,
+        "education": 0.05,
+        "languages": 0.20,
+        "availability": 0.40,  # Very important for retail
+    }),
+    JobCategory.HOSPITALITY: MappingProxyType({
+        "skills": 0.15,
+        "experience": 0.20,
+        "education": 0.05,
+        "languages": 0.30,  # Crucial for hotels/restaurants
+        "availability": 0.30,
+    }),
+    JobCategory.HEALTHCARE: MappingProxyType({
+        "skills": 0.25,
+        "experience": 0.25,
+        "education": 0.20,
+        "languages": 0.15,
+        "availability": 0.15,
+        "certifications": 0.30,  # NEW: Very important
+    }),
+    JobCategory.MANUFACTURING: MappingProxyType({
+        "skills": 0.25,
+        "experience": 0.30,
+        "education": 0.05,
+        "languages": 0.05,
+        "availability": 0.25,
+        "certifications": 0.10,
+    }),
+    JobCategory.CUSTOMER_SERVICE: MappingProxyType({
+        "skills": 0.20,
+        "experience": 0.20,
+        "education": 0.10,
+        "languages": 0.35,  # Very important
+        "availability": 0.15,
+    }),
+})
+
+# Default for other categories
+_DEFAULT_WEIGHTS: Mapping[str, float] = MappingProxyType({
+    "skills": 0.25,
+    "experience": 0.25,
+    "education": 0.15,
+    "languages": 0.15,
+    "availability": 0.15,
+    "certifications": 0.05,
+})
+
+
+# ============================================================================
+# Category Strategy
+# ============================================================================
+#
+# Different scoring strategies for different job categories.
+# Tech jobs focus on skills, while service jobs focus on availability.
+
+def get_scoring_weights(category: str) -> Mapping[str, float]:
+    """Return scoring weights based on job category."""
+    return _WEIGHTS.get(category, _DEFAULT_WEIGHTS)
+
+
+def score_availability(job: JobDB, candidate: CandidateDB) -> Tuple[float, str]:
+    """Score based on shift/weekend availability."""
+    score = 0.0
+    reasons = []
+
+    # Shift work
+    if job.shift_work:
+        if candidate.willing_to_work_shifts:
+            score += 0.5
+            reasons.append("✅ Willing to work shifts")
         else:
-            score += 0.5  # Neutral if not required
-
-        # Weekend work
-        if self.job.weekend_work:
-            if self.candidate.willing_to_work_weekends:
-                score += 0.5
-                reasons.append("✅ Willing to work weekends")
-            else:
-                reasons.append("⚠️ Not willing to work weekends (required)")
-                return 0.0, " | ".join(reasons)  # Hard filter
+            reasons.append("⚠️ Not willing to work shifts (required)")
+            return 0.0, " | ".join(reasons)  # Hard filter
+    else:
+        score += 0.5  # Neutral if not required
+
+    # Weekend work
+    if job.weekend_work:
+        if candidate.willing_to_work_weekends:
+            score += 0.5
+            reasons.append("✅ Willing to work weekends")
         else:
-            score += 0.5  # Neutral if not required
+            reasons.append("⚠️ Not willing to work weekends (required)")
+            return 0.0, " | ".join(reasons)  # Hard filter
+    else:
+        score += 0.5  # Neutral if not required
+
+    return score, " | ".join(reasons) if reasons else "No special availability required"
+
+
+def score_certifications(job: JobDB, candidate: CandidateDB) -> Tuple[float, str]:
+    """Score based on required certifications."""
+    required_certs = job.certifications_lower
+    candidate_certs = candidate.certifications_lower
 
-        return score, " | ".join(reasons) if reasons else "No special availability required"
+    if not required_certs:
+        return 1.0, "No certifications required"
 
-    def score_certifications(self) -> Tuple[float, str]:
-        """Score based on required certifications."""
-        required_certs = set(c.lower() for c in self.job.certifications_required)
-        candidate_certs = set(c.lower() for c in self.candidate.certifications)
+    missing = required_certs - candidate_certs
+    if missing:
+        return 0.0, f"❌ Missing certifications: {', '.join(missing)}"  # Hard filter
 
-        if not required_certs:
-            return 1.0, "No certifications required"
+    matched = required_certs & candidate_certs
+    return 1.0, f"✅ Has all required certifications: {', '.join(matched)}"
 
-        matched = required_certs & candidate_certs
-        missing = required_certs - candidate_certs
 
-        if missing:
-            return 0.0, f"❌ Missing certifications: {', '.join(missing)}"  # Hard filter
+def score_employment_type(job: JobDB, candidate: CandidateDB) -> Tuple[float, str]:
+    """Score based on employment type preference."""
+    if not candidate.preferred_employment_type:
+        return 0.5, "No employment type preference"
 
-        return 1.0, f"✅ Has all required certifications: {', '.join(matched)}"
+    if job.employment_type == candidate.preferred_employment_type:
+        return 1.0, f"✅ Prefers {job.employment_type}"
+
+    return 0.3, f"⚠️ Prefers {candidate.preferred_employment_type}, job is {job.employment_type}"
+
+
+def prefilter(job: JobDB, pool: CandidatePool) -> np.ndarray:
+    """
+    Indices of the pool's candidates that pass the category hard filters
+    (shift/weekend availability and required certifications).
+
+    Runs on the pool's arrays only, so it belongs before any embedding
+    or semantic work: rejected candidates never reach the model.
+    """
+    available = rule_kernels.availability_scores(
+        job.shift_work, job.weekend_work, pool.shift_ok, pool.weekend_ok
+    )
+    certified = rule_kernels.certification_scores(
+        rule_kernels.certification_mask(job.certifications_lower), pool.cert_mask
+    )
+    return np.flatnonzero((available > 0) & (certified > 0))
+
+
+def passes_hard_filters(job: JobDB, candidate: CandidateDB) -> bool:
+    """Single-pair form of prefilter, for ranking jobs for one candidate."""
+    if job.shift_work and not candidate.willing_to_work_shifts:
+        return False
+    if job.weekend_work and not candidate.willing_to_work_weekends:
+        return False
+    return job.certifications_lower <= candidate.certifications_lower
+
+
+def hard_filter_reason(job: JobDB, candidate: CandidateDB) -> Optional[str]:
+    """Rejection reason when the pair fails the category hard filters, else None."""
+    if passes_hard_filters(job, candidate):
+        return None
+    for scorer in (score_availability, score_certifications):
+        score, reason = scorer(job, candidate)
+        if score == 0.0:
+            return f"❌ REJECTED: {reason}"
+    return None
+
+
+# Candidates per tile in score_pool_fused: a tile's embeddings stay in
+# cache while its similarity and final score are computed
+FUSED_TILE_ROWS = 1024
+
+
+def score_pool_fused(
+        job_vec: np.ndarray,
+        pool: CandidatePool,
+        rule_scores: np.ndarray,
+        semantic_weight: float,
+        rule_weight: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Semantic similarity and final weighted score for the whole pool in one
+    tiled pass, instead of a full GEMV followed by a full pass combining
+    it with the rule scores.
+
+    Args:
+        job_vec: L2-normalized job embedding
+        pool: Candidates with `emb` filled in (already prefiltered)
+        rule_scores: Rule scores aligned with the pool
+
+    Returns:
+        (similarity, final), float64 arrays aligned with the pool;
+        similarity is clipped to [0, 1]
+    """
+    n = len(pool)
+    query = np.asarray(job_vec, dtype=np.float32)
 
-    def score_employment_type(self) -> Tuple[float, str]:
-        """Score based on employment type preference."""
-        if not self.candidate.preferred_employment_type:
-            return 0.5, "No employment type preference"
+    similarity = np.empty(n)
+    final = np.empty(n)
 
-        if self.job.employment_type == self.candidate.preferred_employment_type:
-            return 1.0, f"✅ Prefers {self.job.employment_type}"
+    for start in range(0, n, FUSED_TILE_ROWS):
+        tile = slice(start, min(start + FUSED_TILE_ROWS, n))
+        sim = np.clip(pool.emb[tile].astype(np.float32, copy=False) @ query, 0.0, 1.0)
+        similarity[tile] = sim
+        final[tile] = semantic_weight * sim + rule_weight * rule_scores[tile]
 
-        return 0.3, f"⚠️ Prefers {self.candidate.preferred_employment_type}, job is {self.job.employment_type}"
\ No newline at end of file
+    return similarity, final
@@ -0,0 +1,170 @@
+"""
+Embedding caches.
+
+- JobEmbeddingCache: process-wide cache of job embeddings. Job text
+  rarely changes, so embeddings are keyed by job id and tagged with the
+  job's `updated_at`. An entry is only reused while the job has not been
+  modified since it was encoded; the repository also drops the entry
+  explicitly on update/delete.
+
+- embed_cached: text -> embedding cache persisted in the MongoDB
+  `embeddings` collection (keyed by a SHA-256 of model name + text), with
+  an in-process LRU in front. Survives restarts, so unchanged texts are
+  never encoded twice.
+"""
+
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from bson import Binary
+from cachetools import LRUCache, TTLCache
+from pymongo import UpdateOne
+
+from app.config import settings
+from app.db.mongo import MongoClientFactory
+from app.domain.models import JobDB
+
+
+logger = logging.getLogger(__name__)
+
+
+class JobEmbeddingCache:
+    """Thread-safe TTL cache of job embeddings keyed by job id."""
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"emb:{job_id}"
+
+    def get_many(self, jobs: List[JobDB]) -> Dict[str, Any]:
+        """
+        Look up cached embeddings for the given jobs.
+
+        Returns:
+            Mapping of job id to embedding, for fresh hits only
+        """
+        hits = {}
+        with self._lock:
+            for job in jobs:
+                entry: Tuple[datetime, Any] = self._cache.get(self._key(job.id))
+                if entry is not None and entry[0] == job.updated_at:
+                    hits[job.id] = entry[1]
+        return hits
+
+    def set_many(self, jobs: List[JobDB], embeddings) -> None:
+        """Store embeddings for the given jobs (aligned by position)."""
+        with self._lock:
+            for job, embedding in zip(jobs, embeddings):
+                self._cache[self._key(job.id)] = (job.updated_at, embedding)
+
+    def invalidate(self, job_id: str) -> None:
+        """Drop the cached embedding for a job."""
+        with self._lock:
+            self._cache.pop(self._key(job_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "cache_size": len(self._cache),
+            "cache_maxsize": self._cache.maxsize,
+            "cache_ttl": self._cache.ttl
+        }
+
+
+# Global cache instance
+job_embedding_cache = JobEmbeddingCache(
+    maxsize=settings.JOB_EMBEDDING_CACHE_SIZE,
+    ttl=settings.CACHE_TTL
+)
+
+
+# ============================================================================
+# Persistent Text Embedding Cache
+# ============================================================================
+
+_text_lru: LRUCache = LRUCache(maxsize=settings.EMBEDDING_LRU_SIZE)
+_text_lru_lock = threading.Lock()
+
+
+def _model_tag() -> str:
+    if settings.EMBEDDING_BACKEND == "onnx":
+        return f"{settings.EMBEDDING_MODEL}:onnx:{settings.EMBEDDING_ONNX_QUANTIZATION}"
+    if settings.USE_BF16:
+        return f"{settings.EMBEDDING_MODEL}:bf16"
+    if settings.EMBEDDING_TORCH_INT8:
+        return f"{settings.EMBEDDING_MODEL}:qint8"
+    return settings.EMBEDDING_MODEL
+
+
+def text_key(text: str) -> str:
+    """
+    SHA-256 cache key of a text, shared by the in-process and persistent
+    embedding caches. The model (and quantization) is part of the key so
+    switching never reuses old vectors.
+    """
+    return hashlib.sha256(f"{_model_tag()}\0{text}".encode("utf-8")).hexdigest()
+
+
+async def embed_cached(texts: List[str]) -> np.ndarray:
+    """
+    Embed texts, reusing vectors from the in-process LRU and the MongoDB
+    `embeddings` collection. Only texts found in neither are encoded, via
+    the shared EmbeddingBatcher (so concurrent requests share model
+    calls), and the results are written back.
+
+    Returns:
+        float32 matrix of L2-normalized embeddings, one row per text
+    """
+    from app.services.matching_service import embedding_batcher
+
+    keys = [text_key(t) for t in texts]
+    found: Dict[str, np.ndarray] = {}
+
+    with _text_lru_lock:
+        for key in keys:
+            vec = _text_lru.get(key)
+            if vec is not None:
+                found[key] = vec
+
+    collection = MongoClientFactory.get_db()["embeddings"]
+
+    lookup = list({k for k in keys if k not in found})
+    if lookup:
+        async for doc in collection.find({"_id": {"$in": lookup}}, {"v": 1}):
+            found[doc["_id"]] = np.frombuffer(doc["v"], dtype=np.float32)
+
+    missing = {k: t for k, t in zip(keys, texts) if k not in found}
+    if missing:
+        encoded = await embedding_batcher.encode(list(missing.values()))
+        encoded = encoded.astype(np.float32)
+        found.update(zip(missing, encoded))
+
+        try:
+            await collection.bulk_write(
+                [
+                    UpdateOne({"_id": k}, {"$setOnInsert": {"v": Binary(vec.tobytes())}}, upsert=True)
+                    for k, vec in zip(missing, encoded)
+                ],
+                ordered=False
+            )
+        except Exception as e:
+            # The vectors are still valid; they just won't be reused after a restart
+            logger.warning(f"Failed to persist {len(missing)} embeddings: {e}")
+
+        logger.debug(f"Encoded {len(missing)}/{len(texts)} texts ({len(texts) - len(missing)} cache hits)")
+
+    with _text_lru_lock:
+        for key in keys:
+            _text_lru[key] = found[key]
+
+    return np.stack([found[k] for k in keys])
@@ -11,39 +11,61 @@ Key improvements:
 - Type hints throughout
 """
 
-import hashlib
-import logging
-from dataclasses import dataclass
-from functools import lru_cache
-from typing import List, Dict, Optional, Tuple
-from cachetools import TTLCache
-
-from sentence_transformers import SentenceTransformer, util
-import torch
+from __future__ import annotations
 
-from app.domain.models import JobDB, CandidateDB
+import asyncio
+import contextlib
+import heapq
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import lru_cache, partial
+from operator import itemgetter
+from typing import TYPE_CHECKING, AsyncIterator, List, Dict, NamedTuple, Optional, Set, Tuple
+from cachetools import LRUCache
+
+import numpy as np
+
+# torch and sentence-transformers are imported on first model load:
+# together they cost seconds and hundreds of MB at import time
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+from app.domain.models import JobDB, CandidateCreate, CandidateDB
 from app.config import settings
 
-from app.services.category_matching import CategoryMatchingStrategy
+from app.services import category_matching, rule_kernels
+from app.services.candidate_pool import CandidatePool
+from app.services.embedding_cache import embed_cached, job_embedding_cache, text_key
+from app.services.vector_index import candidate_vector_index, job_vector_index
 
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Shared pool for offloading ranking and recommendation scoring from the event loop.
+# Model inference releases the GIL, so threads overlap across cores.
+_RANKING_WORKERS = os.cpu_count() or 1
+RANKING_POOL = ThreadPoolExecutor(
+    max_workers=_RANKING_WORKERS,
+    thread_name_prefix="ranking"
+)
+
 
 # ============================================================================
 # Data Models
 # ============================================================================
 
-@dataclass
-class ScoringBreakdown:
-    """Detailed breakdown of how a score was calculated."""
+class ScoringBreakdown(NamedTuple):
+    """Detailed breakdown of how a score was calculated (immutable)."""
     location_match: float
     salary_match: float
     requirements_match: float
     advantages_match: float
     language_match: float
-    semantic_similarity: float
+    semantic_similarity: float = 0.0
 
     def __str__(self) -> str:
         return (
@@ -56,37 +78,120 @@ class ScoringBreakdown:
         )
 
 
-@dataclass
-class MatchResult:
-    """Result of matching a job with a candidate."""
-    candidate: Optional[CandidateDB] = None
-    job: Optional[JobDB] = None
-    score: float = 0.0
-    semantic_score: float = 0.0
-    rule_score: float = 0.0
-    breakdown: Optional[ScoringBreakdown] = None
-    match_reasons: List[str] = None
-
-    def __post_init__(self):
-        if self.match_reasons is None:
-            self.match_reasons = []
-
-
 # ============================================================================
 # Singleton Model Loader
 # ============================================================================
 
-@lru_cache(maxsize=1)
-def get_embedding_model() -> SentenceTransformer:
+def _load_onnx_model(model_name: str) -> SentenceTransformer:
     """
-    Load the embedding model once and cache it.
-    Uses lru_cache to ensure singleton pattern.
+    Load the model through the ONNX Runtime backend, exporting it (and
+    dynamically quantizing Linear layers to int8) on first use.
+
+    The export is cached under EMBEDDING_ONNX_DIR so later starts load it
+    directly. The result is still a SentenceTransformer, so encode() and
+    normalization behave exactly as with the torch backend.
+    """
+    # Requires: pip install "sentence-transformers[onnx]"
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    quantization = settings.EMBEDDING_ONNX_QUANTIZATION
+    local_dir = os.path.join(settings.EMBEDDING_ONNX_DIR, model_name.replace("/", "__"))
+    file_name = f"onnx/model_qint8_{quantization}.onnx" if quantization else "onnx/model.onnx"
+
+    if not os.path.exists(os.path.join(local_dir, file_name)):
+        logger.info(f"Exporting {model_name} to ONNX ({quantization or 'fp32'}) in {local_dir}")
+        model = SentenceTransformer(model_name, backend="onnx")
+        model.save_pretrained(local_dir)
+        if quantization:
+            export_dynamic_quantized_onnx_model(model, quantization, local_dir)
+
+    return SentenceTransformer(local_dir, backend="onnx", model_kwargs={"file_name": file_name})
+
+
+def _amx_supported() -> bool:
+    import torch
+
+    # Private torch helper (torch>=2.2); treat its absence as "no AMX"
+    is_supported = getattr(torch.cpu, "_is_amx_tile_supported", None)
+    return bool(is_supported and is_supported())
+
+
+def _optimize_bf16(model: SentenceTransformer) -> SentenceTransformer:
+    """
+    Convert the model to BF16 with Intel Extension for PyTorch, so the
+    transformer matmuls run on AMX tiles.
+    """
+    # Requires: pip install intel-extension-for-pytorch
+    import intel_extension_for_pytorch as ipex
+    import torch
+
+    model = ipex.optimize(model.eval(), dtype=torch.bfloat16)
+    model.bf16_autocast = True
+    logger.info("Embedding model optimized for BF16 inference")
+    return model
+
+
+def _quantize_int8(model: SentenceTransformer) -> SentenceTransformer:
+    """
+    Dynamically quantize the transformer's Linear layers to int8 (weights
+    stored as int8, activations quantized per batch).
     """
+    import torch
+
+    transformer = model[0]
+    transformer.auto_model = torch.quantization.quantize_dynamic(
+        transformer.auto_model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+    logger.info("Embedding model quantized to int8 (dynamic)")
+    return model
+
+
+def _inference_context(model: SentenceTransformer) -> contextlib.ExitStack:
+    """Inference mode, plus BF16 autocast for models converted by _optimize_bf16."""
+    import torch
+
+    stack = contextlib.ExitStack()
+    stack.enter_context(torch.inference_mode())
+    if getattr(model, "bf16_autocast", False):
+        stack.enter_context(torch.autocast("cpu", dtype=torch.bfloat16))
+    return stack
+
+
+def _load_embedding_model() -> SentenceTransformer:
+    """Load and configure the embedding model (see get_embedding_model)."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
     model_name = getattr(settings, 'EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
     logger.info(f"Loading embedding model: {model_name}")
 
     try:
-        model = SentenceTransformer(model_name)
+        model = None
+        if settings.EMBEDDING_BACKEND == "onnx":
+            try:
+                model = _load_onnx_model(model_name)
+            except Exception as e:
+                logger.warning(f"ONNX backend unavailable, using torch: {e}")
+
+        if model is None:
+            model = SentenceTransformer(model_name)
+
+        if model.device.type == "cpu":
+            # Leave cores for the event loop and the ranking pool
+            torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+
+            # BF16 where AMX is available, otherwise int8 if enabled (torch backend only)
+            torch_backend = getattr(model, "backend", "torch") == "torch"
+            if settings.USE_BF16 and torch_backend and _amx_supported():
+                try:
+                    model = _optimize_bf16(model)
+                except Exception as e:
+                    logger.warning(f"BF16 optimization unavailable, using fp32: {e}")
+            elif settings.EMBEDDING_TORCH_INT8 and torch_backend:
+                try:
+                    model = _quantize_int8(model)
+                except Exception as e:
+                    logger.warning(f"int8 quantization failed, using fp32: {e}")
         logger.info(f"Successfully loaded model: {model_name}")
         return model
     except Exception as e:
@@ -94,6 +199,272 @@ def get_embedding_model() -> SentenceTransformer:
         raise RuntimeError(f"Could not initialize embedding model: {e}")
 
 
+_model: Optional[SentenceTransformer] = None
+_model_lock = threading.Lock()
+
+
+def get_embedding_model() -> SentenceTransformer:
+    """
+    Load the embedding model once and cache it.
+
+    Double-checked locking: once loaded, a call is a single global read;
+    the lock is only taken while the model is still missing.
+    """
+    global _model
+    model = _model
+    if model is not None:
+        return model
+
+    with _model_lock:
+        if _model is None:
+            _model = _load_embedding_model()
+        return _model
+
+
+def encode_many(texts: List[str], model: Optional[SentenceTransformer] = None) -> np.ndarray:
+    """
+    Encode texts in one batched model call.
+
+    Every encode in the service goes through here, so texts are batched
+    per call rather than per pair. Duplicate texts are encoded once;
+    SentenceTransformer.encode already sorts each call by length, so
+    batches are padded to similar lengths.
+
+    Args:
+        texts: Texts to embed
+        model: Model to use (defaults to the shared model)
+
+    Returns:
+        float32 array of L2-normalized embeddings, one row per text
+    """
+    model = model or get_embedding_model()
+    unique = list(dict.fromkeys(texts))
+
+    with _inference_context(model):
+        embeddings = model.encode(
+            unique,
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+    if len(unique) == len(texts):
+        return embeddings
+
+    position = {text: i for i, text in enumerate(unique)}
+    return embeddings[[position[text] for text in texts]]
+
+
+# Bounds concurrent encodes from async code; each already uses several threads
+_embed_semaphore = asyncio.Semaphore(settings.EMBED_CONCURRENCY)
+
+_OOM_RETRIES = 2
+
+
+async def aembed(texts: List[str]) -> np.ndarray:
+    """
+    encode_many() off the event loop.
+
+    At most EMBED_CONCURRENCY encodes run at once so concurrent requests
+    don't oversubscribe the CPU. A CUDA out-of-memory error is retried
+    after freeing the allocator cache, with backoff.
+    """
+    import torch
+
+    async with _embed_semaphore:
+        for attempt in range(_OOM_RETRIES + 1):
+            try:
+                return await asyncio.to_thread(encode_many, texts)
+            except torch.cuda.OutOfMemoryError:
+                if attempt == _OOM_RETRIES:
+                    raise
+                logger.warning(f"CUDA out of memory encoding {len(texts)} texts, retrying")
+                torch.cuda.empty_cache()
+                await asyncio.sleep(0.1 * 2 ** attempt)
+
+
+class EmbeddingBatcher:
+    """
+    Merges concurrent async encode requests into shared model calls.
+
+    Requests are queued; a single runner task takes the first waiting
+    request, collects whatever else arrives within EMBED_BATCH_WAIT_MS (up
+    to EMBED_BATCH_MAX texts) and encodes them all with one aembed() call.
+    A lone request is dispatched as soon as the window closes, so under
+    light load it only pays the window as extra latency.
+    """
+
+    def __init__(self, max_wait_ms: float, max_batch: int):
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._dispatching: Set[asyncio.Task] = set()  # Keeps running encodes referenced
+
+    def _ensure_runner(self) -> asyncio.Queue:
+        """Start the runner on the current loop (again, if the loop changed)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._runner is None or self._runner.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._runner = loop.create_task(self._run())
+        return self._queue
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts, batched with other requests in flight.
+
+        Returns:
+            float32 array of L2-normalized embeddings, one row per text
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        future = asyncio.get_running_loop().create_future()
+        self._ensure_runner().put_nowait((texts, future))
+        return await future
+
+    async def _drain(self) -> List[Tuple[List[str], asyncio.Future]]:
+        """Wait for one request, then gather more until the window closes or the batch is full."""
+        batch = [await self._queue.get()]
+        size = len(batch[0][0])
+        deadline = self._loop.time() + self.max_wait
+
+        while size < self.max_batch:
+            try:
+                if self._queue.empty():
+                    remaining = deadline - self._loop.time()
+                    if remaining <= 0:
+                        break
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._drain()
+            # Encode in the background so the next window fills meanwhile;
+            # aembed's semaphore bounds how many encodes run at once
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatching.add(task)
+            task.add_done_callback(self._dispatching.discard)
+
+    @staticmethod
+    async def _dispatch(batch: List[Tuple[List[str], asyncio.Future]]) -> None:
+        texts = [text for item, _ in batch for text in item]
+        try:
+            embeddings = await aembed(texts)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        start = 0
+        for item, future in batch:
+            if not future.done():  # Caller may have been cancelled
+                future.set_result(embeddings[start:start + len(item)])
+            start += len(item)
+
+    async def close(self) -> None:
+        """Stop the runner task."""
+        if self._runner is not None:
+            self._runner.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._runner
+            self._runner = None
+
+
+# Shared by all async encode paths
+embedding_batcher = EmbeddingBatcher(
+    max_wait_ms=settings.EMBED_BATCH_WAIT_MS,
+    max_batch=settings.EMBED_BATCH_MAX
+)
+
+
+# ============================================================================
+# Phrase Matching
+# ============================================================================
+
+@lru_cache(maxsize=2048)
+def _phrase_automaton(phrases: Tuple[str, ...]):
+    """
+    Aho-Corasick automaton over lowercased phrases, mapping each phrase to
+    the positions it occupies in `phrases` (None if pyahocorasick is not
+    installed or there are no non-empty phrases). Cached, so a job's
+    requirements are compiled once and reused for every candidate it is
+    scored against.
+    """
+    # Requires: pip install pyahocorasick
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+
+    positions: Dict[str, List[int]] = {}
+    for i, phrase in enumerate(phrases):
+        if phrase:
+            positions.setdefault(phrase, []).append(i)
+    if not positions:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for phrase, indices in positions.items():
+        automaton.add_word(phrase, tuple(indices))
+    automaton.make_automaton()
+    return automaton
+
+
+# Shorter phrase lists are searched one phrase at a time: a few C-level
+# substring searches beat walking the text through an automaton
+AUTOMATON_MIN_PHRASES = 8
+
+
+def _count_phrases_in(phrases: Tuple[str, ...], text: str) -> int:
+    """
+    Count the lowercased phrases that occur in lowercased `text`. Long
+    phrase lists are matched in one pass over the text.
+    """
+    if len(phrases) < AUTOMATON_MIN_PHRASES:
+        return sum(1 for phrase in phrases if phrase in text)
+
+    automaton = _phrase_automaton(phrases)
+    if automaton is None:
+        return sum(1 for phrase in phrases if phrase in text)
+
+    found = set()
+    for _, indices in automaton.iter(text):
+        found.update(indices)
+    # "" is a substring of any text
+    return len(found) + sum(1 for phrase in phrases if not phrase)
+
+
+# ============================================================================
+# Result Ordering
+# ============================================================================
+
+_by_score = itemgetter("score")
+
+
+def _top_by_score(results: List[Dict], top_k: Optional[int] = None) -> List[Dict]:
+    """
+    Match results sorted by score (highest first), cut to `top_k`.
+
+    With top_k below the number of results this is a heap selection,
+    O(N log k) instead of a full sort; ties keep their original order
+    either way.
+    """
+    if top_k is not None and top_k < len(results):
+        return heapq.nlargest(top_k, results, key=_by_score)
+    results.sort(key=_by_score, reverse=True)
+    return results
+
+
 # ============================================================================
 # Main Matching Service
 # ============================================================================
@@ -113,6 +484,17 @@ class MatchingService:
     SALARY_MAX = 1.0
     REQUIREMENTS_MAX = 1.0
 
+    # Number of items scored per worker task in the async rankers
+    RANK_CHUNK_SIZE = 64
+
+    # Two-stage ranking: semantic scoring runs on the top (k * this) by rule score
+    TWO_STAGE_OVERSAMPLE = 3
+    # ...but never fewer than this many, since the semantic score outweighs the rule score
+    TWO_STAGE_MIN_SHORTLIST = 50
+
+    # int8 cache codes: components of a unit vector lie in [-1, 1]
+    INT8_SCALE = 127.0
+
     def __init__(self, model: Optional[SentenceTransformer] = None):
         """
         Initialize the matching service.
@@ -122,18 +504,20 @@ class MatchingService:
         """
         self.model = model or get_embedding_model()
 
-        # Initialize caches
-        cache_ttl = getattr(settings, 'CACHE_TTL', 3600)
+        # Initialize caches. Entries are keyed by text, so they can't go
+        # stale; plain LRU eviction avoids TTL bookkeeping on every access.
         cache_size = getattr(settings, 'CACHE_SIZE', 1000)
 
-        self._embedding_cache: TTLCache = TTLCache(
-            maxsize=cache_size,
-            ttl=cache_ttl
-        )
+        self._embedding_cache: LRUCache = LRUCache(maxsize=cache_size)
+        self._cache_int8 = settings.EMBEDDING_CACHE_INT8
+        # LRUCache is not thread-safe; rankers may run on several threads
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
 
         logger.info(
             f"Initialized MatchingService with cache "
-            f"(size={cache_size}, ttl={cache_ttl}s)"
+            f"(size={cache_size})"
         )
 
     # ------------------------------------------------------------------------
@@ -141,10 +525,13 @@ class MatchingService:
     # ------------------------------------------------------------------------
 
     def _get_text_hash(self, text: str) -> str:
-        """Generate a cache key for text."""
-        return hashlib.md5(text.encode('utf-8')).hexdigest()
+        """
+        Generate a cache key for text (the same SHA-256 key as the
+        persistent embedding cache).
+        """
+        return text_key(text)
 
-    def _get_embedding(self, text: str) -> torch.Tensor:
+    def _get_embedding(self, text: str) -> np.ndarray:
         """
         Get embedding for text with caching.
 
@@ -152,23 +539,195 @@ class MatchingService:
             text: Input text to embed
 
         Returns:
-            Cached or newly computed embedding tensor
+            Cached or newly computed L2-normalized float16 embedding
         """
         cache_key = self._get_text_hash(text)
 
-        if cache_key in self._embedding_cache:
-            logger.debug(f"Cache hit for text hash: {cache_key[:8]}...")
-            return self._embedding_cache[cache_key]
+        with self._cache_lock:
+            cached = self._embedding_cache.get(cache_key)
+            if cached is not None:
+                self._cache_hits += 1
+            else:
+                self._cache_misses += 1
+        if cached is not None:
+            logger.debug(f"Cache hit for text hash: {cache_key}")
+            return self._from_cache(cached)
 
         try:
-            embedding = self.model.encode(text, convert_to_tensor=True)
-            self._embedding_cache[cache_key] = embedding
-            logger.debug(f"Cached new embedding: {cache_key[:8]}...")
+            embedding = self._encode_normalized([text])[0].astype(np.float16)
+            with self._cache_lock:
+                self._embedding_cache[cache_key] = self._to_cache(embedding)
+            logger.debug(f"Cached new embedding: {cache_key}")
             return embedding
         except Exception as e:
             logger.error(f"Failed to generate embedding: {e}", exc_info=True)
             raise
 
+    def _get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Batched _get_embedding: cached texts are reused and all the others
+        are encoded in one model call.
+
+        Returns:
+            float16 matrix of L2-normalized embeddings, aligned with `texts`
+        """
+        keys = [self._get_text_hash(text) for text in texts]
+
+        with self._cache_lock:
+            found = {key: self._embedding_cache.get(key) for key in keys}
+            found = {key: emb for key, emb in found.items() if emb is not None}
+            self._cache_hits += sum(1 for key in keys if key in found)
+            self._cache_misses += sum(1 for key in keys if key not in found)
+
+        found = {key: self._from_cache(emb) for key, emb in found.items()}
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        if missing:
+            encoded = self._encode_normalized(list(missing.values())).astype(np.float16)
+            found.update(zip(missing, encoded))
+            with self._cache_lock:
+                for key, emb in zip(missing, encoded):
+                    self._embedding_cache[key] = self._to_cache(emb)
+
+        return np.stack([found[key] for key in keys])
+
+    def _to_cache(self, embedding: np.ndarray) -> np.ndarray:
+        """Storage form of a float16 embedding (int8 codes with EMBEDDING_CACHE_INT8)."""
+        if not self._cache_int8:
+            return embedding
+        codes = np.rint(embedding.astype(np.float32) * self.INT8_SCALE)
+        return np.clip(codes, -127, 127).astype(np.int8)
+
+    def _from_cache(self, stored: np.ndarray) -> np.ndarray:
+        """float16 embedding back from its storage form."""
+        if stored.dtype != np.int8:
+            return stored
+        return (stored.astype(np.float32) / self.INT8_SCALE).astype(np.float16)
+
+    def _encode_normalized(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts in one batched model call (no caching).
+
+        Returns:
+            float32 array of L2-normalized embeddings, one row per text
+        """
+        try:
+            return encode_many(texts, self.model)
+        except Exception as e:
+            logger.error(f"Failed to generate embeddings: {e}", exc_info=True)
+            raise
+
+    def _get_job_embeddings(self, jobs: List[JobDB]) -> np.ndarray:
+        """
+        Get embeddings for jobs, reusing the process-wide job embedding
+        cache and encoding only jobs that are new or were modified.
+
+        Embeddings are L2-normalized once when encoded and stored as
+        float16, so cosine similarity is a plain dot product.
+
+        Returns:
+            float16 matrix of shape (len(jobs), dim), aligned with the input order
+        """
+        embeddings = job_embedding_cache.get_many(jobs)
+
+        missing = [job for job in jobs if job.id not in embeddings]
+        if missing:
+            texts = [self._build_job_text(job) for job in missing]
+            encoded = self._encode_normalized(texts).astype(np.float16)
+            job_embedding_cache.set_many(missing, encoded)
+            embeddings.update((job.id, emb) for job, emb in zip(missing, encoded))
+
+            logger.debug(
+                f"Encoded {len(missing)}/{len(jobs)} jobs "
+                f"({len(jobs) - len(missing)} cache hits)"
+            )
+
+        return np.stack([embeddings[job.id] for job in jobs])
+
+    def index_jobs(self, jobs: List[JobDB]) -> None:
+        """Add or refresh jobs in the job vector index."""
+        if jobs:
+            job_vector_index.upsert_many(
+                [job.id for job in jobs],
+                self._get_job_embeddings(jobs)
+            )
+
+    async def warm_job_embeddings(self, jobs: List[JobDB]) -> None:
+        """
+        Fill the job embedding cache for jobs missing from it, reading
+        from the persistent embedding cache before encoding.
+        """
+        cached = job_embedding_cache.get_many(jobs)
+        missing = [job for job in jobs if job.id not in cached]
+        if missing:
+            vectors = await embed_cached([self._build_job_text(job) for job in missing])
+            job_embedding_cache.set_many(missing, vectors.astype(np.float16))
+
+    async def encode_candidate(self, candidate: CandidateCreate) -> List[float]:
+        """
+        Encode a candidate profile for storage on the candidate document.
+
+        Returns:
+            The L2-normalized embedding as a list of floats
+        """
+        vectors = await embed_cached([self._build_candidate_text(candidate)])
+        return vectors[0].tolist()
+
+    def get_job_vector(self, job: JobDB) -> np.ndarray:
+        """Get the job's L2-normalized embedding as a float32 vector."""
+        return self._get_job_embeddings([job])[0].astype(np.float32)
+
+    def get_candidate_vector(self, candidate: CandidateDB) -> np.ndarray:
+        """
+        Get the candidate's profile embedding as an L2-normalized
+        float32 vector.
+
+        Uses the embedding stored on the candidate when present, so no
+        encoding is needed online.
+        """
+        if candidate.embedding:
+            cand_vec = np.asarray(candidate.embedding, dtype=np.float32)
+            # Ignore vectors stored by a different embedding model
+            if cand_vec.size == self.model.get_sentence_embedding_dimension():
+                return cand_vec
+
+        return self._get_embedding(self._build_candidate_text(candidate)).astype(np.float32)
+
+    def get_candidate_vectors(self, candidates: List[CandidateDB]) -> np.ndarray:
+        """
+        Get L2-normalized float32 profile embeddings for many candidates.
+
+        Stored embeddings are used where present; the remaining candidates
+        come from the embedding cache or are encoded in one batched model call.
+
+        Returns:
+            float32 matrix of shape (len(candidates), dim), aligned with the input order
+        """
+        dim = self.model.get_sentence_embedding_dimension()
+        vectors: List[Optional[np.ndarray]] = [
+            np.asarray(c.embedding, dtype=np.float32)
+            if c.embedding and len(c.embedding) == dim else None
+            for c in candidates
+        ]
+
+        missing = [i for i, vec in enumerate(vectors) if vec is None]
+        if missing:
+            encoded = self._get_embeddings(
+                [self._build_candidate_text(candidates[i]) for i in missing]
+            ).astype(np.float32)
+            for i, vec in zip(missing, encoded):
+                vectors[i] = vec
+
+        return np.stack(vectors).astype(np.float32, copy=False)
+
+    def index_candidates(self, candidates: List[CandidateDB]) -> None:
+        """Add or refresh candidates in the candidate vector index."""
+        if candidates:
+            candidate_vector_index.upsert_many(
+                [c.id for c in candidates],
+                self.get_candidate_vectors(candidates)
+            )
+
     def _build_job_text(self, job: JobDB) -> str:
         """Build searchable text representation of a job."""
         parts = [
@@ -181,7 +740,7 @@ class MatchingService:
         ]
         return " ".join(filter(None, parts))
 
-    def _build_candidate_text(self, candidate: CandidateDB) -> str:
+    def _build_candidate_text(self, candidate: CandidateCreate) -> str:
         """Build searchable text representation of a candidate."""
         parts = [
             candidate.name,
@@ -215,7 +774,8 @@ class MatchingService:
             job_emb = self._get_embedding(job_text)
             cand_emb = self._get_embedding(candidate_text)
 
-            similarity = util.pytorch_cos_sim(job_emb, cand_emb).item()
+            # Both embeddings are unit vectors, so the dot product is the cosine
+            similarity = float(np.dot(job_emb.astype(np.float32), cand_emb.astype(np.float32)))
 
             # Ensure bounds [0, 1]
             return max(0.0, min(1.0, similarity))
@@ -227,6 +787,24 @@ class MatchingService:
             )
             return 0.0
 
+    @staticmethod
+    def _batch_semantic_scores(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        """
+        Semantic scores of one embedding against many in a single GEMV.
+
+        Both sides are L2-normalized when encoded, so the dot product is
+        the cosine similarity; no per-pair calls or re-normalization.
+
+        Args:
+            query: L2-normalized float32 vector
+            matrix: L2-normalized rows (float16 or float32)
+
+        Returns:
+            float64 similarities clipped to [0, 1], one per row
+        """
+        similarities = matrix.astype(np.float32, copy=False) @ query
+        return np.clip(similarities, 0.0, 1.0).astype(np.float64)
+
     # ------------------------------------------------------------------------
     # Rule-Based Scoring
     # ------------------------------------------------------------------------
@@ -238,10 +816,11 @@ class MatchingService:
         Returns:
             (score, explanation)
         """
-        job_loc = job.location.lower().strip()
-        cand_loc = candidate.location.lower().strip()
+        job_loc = job.location_lower
+        cand_loc = candidate.location_lower
 
-        if job_loc == cand_loc:
+        # Interned, so an exact match is usually an identity check
+        if job_loc is cand_loc or job_loc == cand_loc:
             return (1.0, "Exact location match")
 
         # Check if one location contains the other (e.g., "Tel Aviv" in "Tel Aviv, Israel")
@@ -250,12 +829,17 @@ class MatchingService:
 
         return (0.3, "Different location")
 
-    def _score_salary(self, job: JobDB, candidate: CandidateDB) -> Tuple[float, str]:
+    def _score_salary(
+            self,
+            job: JobDB,
+            candidate: CandidateDB,
+            explain: bool = True
+    ) -> Tuple[float, str]:
         """
         Score salary compatibility.
 
         Returns:
-            (score, explanation)
+            (score, explanation); the explanation is "" unless `explain`
         """
         # If no salary constraints on job, neutral score
         if job.salary_min is None and job.salary_max is None:
@@ -265,57 +849,53 @@ class MatchingService:
 
         # Check if candidate is within range
         if job.salary_min is not None and expectation < job.salary_min:
-            return (0.0, f"Below minimum salary (expects {expectation}, min {job.salary_min})")
+            return (0.0, f"Below minimum salary (expects {expectation}, min {job.salary_min})" if explain else "")
 
         if job.salary_max is not None and expectation > job.salary_max:
-            return (0.0, f"Above maximum salary (expects {expectation}, max {job.salary_max})")
+            return (0.0, f"Above maximum salary (expects {expectation}, max {job.salary_max})" if explain else "")
 
         # Within range
         if job.salary_min is not None and job.salary_max is not None:
-            return (1.0, f"Salary in range ({job.salary_min}-{job.salary_max})")
+            return (1.0, f"Salary in range ({job.salary_min}-{job.salary_max})" if explain else "")
 
         # Only max constraint and candidate is below it
         if job.salary_max is not None:
-            return (1.0, f"Below maximum salary (max {job.salary_max})")
+            return (1.0, f"Below maximum salary (max {job.salary_max})" if explain else "")
 
         # Only min constraint and candidate is above it
         if job.salary_min is not None:
-            return (1.0, f"Above minimum salary (min {job.salary_min})")
+            return (1.0, f"Above minimum salary (min {job.salary_min})" if explain else "")
 
         return (0.5, "Salary not specified")
 
     def _score_requirements(
             self,
             job: JobDB,
-            candidate: CandidateDB
+            candidate: CandidateDB,
+            explain: bool = True
     ) -> Tuple[float, str]:
         """
         Score how well candidate meets job requirements.
 
         Returns:
-            (score, explanation)
+            (score, explanation); the explanation is "" unless `explain`
         """
         if not job.requirements:
             return (1.0, "No requirements specified")
 
-        # Build searchable experience text
-        experience_text = " ".join(candidate.experience).lower()
-        skill_text = " ".join(candidate.skills).lower()
-        combined_text = f"{experience_text} {skill_text}"
+        # Searchable experience + skills text, built once per candidate
+        combined_text = candidate.match_text
 
-        matched_requirements = []
-        for req in job.requirements:
-            if req.lower() in combined_text:
-                matched_requirements.append(req)
+        matched_requirements = _count_phrases_in(job.requirements_lower, combined_text)
 
-        match_ratio = len(matched_requirements) / len(job.requirements)
+        match_ratio = matched_requirements / len(job.requirements)
 
         if match_ratio == 1.0:
-            return (1.0, f"Meets all {len(job.requirements)} requirements")
+            return (1.0, f"Meets all {len(job.requirements)} requirements" if explain else "")
         elif match_ratio > 0:
             return (
                 match_ratio,
-                f"Meets {len(matched_requirements)}/{len(job.requirements)} requirements"
+                f"Meets {matched_requirements}/{len(job.requirements)} requirements" if explain else ""
             )
         else:
             return (0.0, "No requirements met")
@@ -323,35 +903,31 @@ class MatchingService:
     def _score_advantages(
             self,
             job: JobDB,
-            candidate: CandidateDB
+            candidate: CandidateDB,
+            explain: bool = True
     ) -> Tuple[float, str]:
         """
         Score how many 'nice-to-have' advantages candidate has.
         This is a bonus, not a requirement.
 
         Returns:
-            (bonus_score, explanation)
+            (bonus_score, explanation); the explanation is "" unless `explain`
         """
         if not job.advantages:
             return (0.0, "No advantages specified")
 
-        experience_text = " ".join(candidate.experience).lower()
-        skill_text = " ".join(candidate.skills).lower()
-        combined_text = f"{experience_text} {skill_text}"
+        combined_text = candidate.match_text
 
-        matched_advantages = []
-        for adv in job.advantages:
-            if adv.lower() in combined_text:
-                matched_advantages.append(adv)
+        matched_advantages = _count_phrases_in(job.advantages_lower, combined_text)
 
         # Each advantage is worth something (max capped)
         bonus_per_match = 0.2
-        bonus = min(1.0, len(matched_advantages) * bonus_per_match)
+        bonus = min(1.0, matched_advantages * bonus_per_match)
 
         if matched_advantages:
             return (
                 bonus,
-                f"Has {len(matched_advantages)}/{len(job.advantages)} nice-to-haves"
+                f"Has {matched_advantages}/{len(job.advantages)} nice-to-haves" if explain else ""
             )
 
         return (0.0, "No advantages matched")
@@ -359,43 +935,46 @@ class MatchingService:
     def _score_languages(
             self,
             job: JobDB,
-            candidate: CandidateDB
+            candidate: CandidateDB,
+            explain: bool = True
     ) -> Tuple[float, str]:
         """
         Score language requirements.
 
         Returns:
-            (score, explanation)
+            (score, explanation); the explanation is "" unless `explain`
         """
-        required_languages = getattr(job, 'required_languages', [])
+        required_set = job.languages_lower
 
-        if not required_languages:
+        if not required_set:
             return (0.0, "No language requirements")
 
-        # Normalize language names
-        required_set = {lang.lower().strip() for lang in required_languages}
-        candidate_langs = {lang.lower().strip() for lang in candidate.languages}
-
-        matched = required_set & candidate_langs
+        matched = required_set & candidate.languages_lower
 
         if len(matched) == len(required_set):
-            return (1.0, f"Speaks all required languages: {', '.join(matched)}")
+            return (1.0, f"Speaks all required languages: {', '.join(matched)}" if explain else "")
         elif matched:
             return (
                 len(matched) / len(required_set),
-                f"Speaks {len(matched)}/{len(required_set)} required languages"
+                f"Speaks {len(matched)}/{len(required_set)} required languages" if explain else ""
             )
         else:
-            return (0.0, f"Missing required languages: {', '.join(required_set)}")
+            return (0.0, f"Missing required languages: {', '.join(required_set)}" if explain else "")
 
     def _calculate_rule_score(
             self,
             job: JobDB,
-            candidate: CandidateDB
+            candidate: CandidateDB,
+            explain: bool = True
     ) -> Tuple[float, ScoringBreakdown, List[str]]:
         """
         Calculate rule-based score with detailed breakdown.
 
+        Args:
+            explain: Build the human-readable reasons. Rankers that only
+                need the numbers (e.g. pre-ranking) pass False and skip
+                all string formatting.
+
         Returns:
             (total_rule_score, breakdown, reasons)
         """
@@ -403,25 +982,27 @@ class MatchingService:
 
         # Location
         loc_score, loc_reason = self._score_location(job, candidate)
-        reasons.append(f"📍 {loc_reason}")
 
         # Salary
-        sal_score, sal_reason = self._score_salary(job, candidate)
-        reasons.append(f"💰 {sal_reason}")
+        sal_score, sal_reason = self._score_salary(job, candidate, explain)
 
         # Requirements (critical)
-        req_score, req_reason = self._score_requirements(job, candidate)
-        reasons.append(f"✅ {req_reason}")
+        req_score, req_reason = self._score_requirements(job, candidate, explain)
 
         # Advantages (bonus)
-        adv_score, adv_reason = self._score_advantages(job, candidate)
-        if adv_score > 0:
-            reasons.append(f"⭐ {adv_reason}")
+        adv_score, adv_reason = self._score_advantages(job, candidate, explain)
 
         # Languages
-        lang_score, lang_reason = self._score_languages(job, candidate)
-        if lang_score > 0 or getattr(job, 'required_languages', []):
-            reasons.append(f"🗣️ {lang_reason}")
+        lang_score, lang_reason = self._score_languages(job, candidate, explain)
+
+        if explain:
+            reasons.append(f"📍 {loc_reason}")
+            reasons.append(f"💰 {sal_reason}")
+            reasons.append(f"✅ {req_reason}")
+            if adv_score > 0:
+                reasons.append(f"⭐ {adv_reason}")
+            if lang_score > 0 or getattr(job, 'required_languages', []):
+                reasons.append(f"🗣️ {lang_reason}")
 
         # Create breakdown
         breakdown = ScoringBreakdown(
@@ -451,95 +1032,272 @@ class MatchingService:
 
         return final_rule_score, breakdown, reasons
 
+    def _rule_scores_bulk(
+            self,
+            job: JobDB,
+            pool: CandidatePool
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Numeric rule scores for one job against a pool of candidates,
+        without explanations. Salary runs as one rule_kernels call over the
+        pool's salary column; the string-based components reuse the
+        per-pair scorers with explain=False.
+
+        Returns:
+            (rule_scores, rejected): the same values _calculate_rule_score
+            and the hard filters give, per candidate. A candidate that fails
+            to score gets NaN and is not marked rejected.
+        """
+        n = len(pool)
+        salary = rule_kernels.salary_scores(pool.salary, job.salary_min, job.salary_max)
+
+        location = np.empty(n)
+        requirements = np.empty(n)
+        bonus = np.empty(n)
+        for i, candidate in enumerate(pool.candidates):
+            try:
+                location[i] = self._score_location(job, candidate)[0]
+                requirements[i] = self._score_requirements(job, candidate, explain=False)[0]
+                bonus[i] = (
+                    self._score_advantages(job, candidate, explain=False)[0] +
+                    self._score_languages(job, candidate, explain=False)[0]
+                )
+            except Exception:
+                location[i] = requirements[i] = bonus[i] = np.nan
+
+        # Same arithmetic as _calculate_rule_score
+        core = (
+                location * self.LOCATION_MAX +
+                salary * self.SALARY_MAX +
+                requirements * self.REQUIREMENTS_MAX
+        )
+        rule_scores = np.clip(core / 3.0 + bonus * 0.1, 0.0, 1.0)
+        rejected = (salary == 0.0) | (requirements == 0.0)
+        return rule_scores, rejected
+
+    def _rule_scores_for_jobs(
+            self,
+            candidate: CandidateDB,
+            jobs: List[JobDB]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        _rule_scores_bulk with the sides swapped: numeric rule scores of
+        one candidate against many jobs. Each job has its own salary range
+        and phrases, so this runs the per-pair scorer without explanations.
+
+        Returns:
+            (rule_scores, rejected), as _rule_scores_bulk
+        """
+        rule_scores = np.empty(len(jobs))
+        rejected = np.zeros(len(jobs), dtype=bool)
+        for i, job in enumerate(jobs):
+            try:
+                rule_scores[i], breakdown, _ = self._calculate_rule_score(job, candidate, explain=False)
+            except Exception:
+                rule_scores[i] = np.nan
+                continue
+            rejected[i] = self._is_rejected(breakdown)
+        return rule_scores, rejected
+
     # ------------------------------------------------------------------------
     # High-Level Matching Functions
     # ------------------------------------------------------------------------
 
-    def _calculate_match(
+    def _match_fast(
             self,
             job: JobDB,
-            candidate: CandidateDB
-    ) -> MatchResult:
+            candidate: CandidateDB,
+            semantic_score: Optional[float] = None,
+            min_score: float = 0.0,
+            subject: str = "candidate"
+    ) -> Optional[Dict]:
         """
-        Calculate complete match score between job and candidate.
+        Score one pair and build its API response dict, applying the hard
+        filters and min_score.
+
+        Args:
+            semantic_score: Precomputed semantic similarity (0-1). If None,
+                it is computed for this pair unless the hard filters reject it.
+            min_score: Minimum score threshold (0-100)
+            subject: Response key for the ranked item, "candidate" or "job"
 
         Returns:
-            MatchResult with all scoring details
+            Match result dict, or None if it scores below min_score
         """
+        item = candidate if subject == "candidate" else job
         try:
-            # Semantic scoring
-            semantic_score = self._calculate_semantic_score(job, candidate)
-
-            # Rule-based scoring
-            rule_score, breakdown, reasons = self._calculate_rule_score(
-                job, candidate
-            )
-
-            # Update breakdown with semantic score
-            breakdown.semantic_similarity = semantic_score
-
-            # Hard filters (immediate rejection)
-            if breakdown.salary_match == 0.0:
-                reasons.append("❌ REJECTED: Salary mismatch")
-                return MatchResult(
-                    candidate=candidate,
-                    job=job,
-                    score=0.0,
-                    semantic_score=semantic_score * 100,
-                    rule_score=rule_score * 100,
-                    breakdown=breakdown,
-                    match_reasons=reasons
+            rule_score, breakdown, reasons = self._calculate_rule_score(job, candidate)
+
+            if self._is_rejected(breakdown):
+                rejection = self._rejection_reason(breakdown)
+            else:
+                rejection = category_matching.hard_filter_reason(job, candidate)
+
+            if rejection:
+                if min_score > 0:
+                    return None
+                reasons.append(rejection)
+                # Rejected pairs score 0 and keep the unrounded rule score
+                score, semantic_pct, rule_pct = 0.0, 0.0, rule_score * 100
+            else:
+                if semantic_score is None:
+                    if self._below_threshold(rule_score, min_score):
+                        return None
+                    semantic_score = self._calculate_semantic_score(job, candidate)
+                final_score = (
+                        self.SEMANTIC_WEIGHT * semantic_score +
+                        self.RULE_WEIGHT * rule_score
                 )
-
-            if breakdown.requirements_match == 0.0:
-                reasons.append("❌ REJECTED: Missing critical requirements")
-                return MatchResult(
-                    candidate=candidate,
-                    job=job,
-                    score=0.0,
-                    semantic_score=semantic_score * 100,
-                    rule_score=rule_score * 100,
-                    breakdown=breakdown,
-                    match_reasons=reasons
-                )
-
-            # Calculate final weighted score
-            final_score = (
-                    self.SEMANTIC_WEIGHT * semantic_score +
-                    self.RULE_WEIGHT * rule_score
-            )
-
-            # Convert to percentage
-            final_percentage = final_score * 100
-
-            return MatchResult(
-                candidate=candidate,
-                job=job,
-                score=round(final_percentage, 2),
-                semantic_score=round(semantic_score * 100, 2),
-                rule_score=round(rule_score * 100, 2),
-                breakdown=breakdown,
-                match_reasons=reasons
-            )
+                score = round(final_score * 100, 2)
+                if score < min_score:
+                    return None
+                semantic_pct = round(semantic_score * 100, 2)
+                rule_pct = round(rule_score * 100, 2)
 
         except Exception as e:
             logger.error(
                 f"Failed to calculate match for job={job.id}, "
                 f"candidate={candidate.id}: {e}",
-                exc_info=True
+                exc_info=e
             )
-            return MatchResult(
-                candidate=candidate,
-                job=job,
-                score=0.0,
-                match_reasons=[f"❌ Error during matching: {str(e)}"]
+            if min_score > 0:
+                return None
+            return {
+                subject: item,
+                "score": 0.0,
+                "semantic_score": 0.0,
+                "rule_score": 0.0,
+                "match_reasons": [f"❌ Error during matching: {str(e)}"],
+                "breakdown": self._breakdown_entry(None)
+            }
+
+        return {
+            subject: item,
+            "score": score,
+            "semantic_score": semantic_pct,
+            "rule_score": rule_pct,
+            "match_reasons": reasons,
+            "breakdown": self._breakdown_entry(breakdown)
+        }
+
+    def _below_threshold(self, rule_score: float, min_score: float) -> bool:
+        """
+        Whether a pair misses min_score (0-100) even with a perfect semantic
+        score, so encoding it can be skipped.
+        """
+        if min_score <= 0:
+            return False
+        upper_bound = (self.SEMANTIC_WEIGHT + self.RULE_WEIGHT * rule_score) * 100
+        # Same rounding slack as the rankers' prefilters
+        return upper_bound < min_score - 0.01
+
+    @staticmethod
+    def _is_rejected(breakdown: ScoringBreakdown) -> bool:
+        """Hard filters: a salary mismatch or no requirement met."""
+        return breakdown.salary_match == 0.0 or breakdown.requirements_match == 0.0
+
+    @staticmethod
+    def _rejection_reason(breakdown: ScoringBreakdown) -> str:
+        if breakdown.salary_match == 0.0:
+            return "❌ REJECTED: Salary mismatch"
+        return "❌ REJECTED: Missing critical requirements"
+
+    def _rank(
+            self,
+            pivot,
+            others: List,
+            pivot_is_job: bool,
+            min_score: float = 0.0,
+            top_k: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Shared ranking path of rank_candidates_for_job and
+        rank_jobs_for_candidate.
+
+        Numeric rule scores and hard filters run first for all `others`;
+        candidates are packed into a CandidatePool once and checked with
+        category_matching.prefilter. Pairs that fail the category hard
+        filters (availability and required certifications) are treated
+        like salary/requirement rejections: never embedded, and returned
+        with score 0 and a rejection reason. The pivot is embedded once
+        and the others that passed the filters are looked up/encoded in
+        one batch; candidates are scored with score_pool_fused, jobs with
+        a single GEMV. Explained matches are built only for pairs that
+        can reach min_score, and the best top_k are selected with a heap.
+
+        Args:
+            pivot: The job (pivot_is_job) or candidate being matched
+            others: Candidates (pivot_is_job) or jobs to rank
+        """
+        if not others:
+            return []
+
+        if pivot_is_job:
+            pool = CandidatePool.from_db(others)
+            rule_scores, rejected = self._rule_scores_bulk(pivot, pool)
+            passed = np.zeros(len(others), dtype=bool)
+            passed[category_matching.prefilter(pivot, pool)] = True
+        else:
+            rule_scores, rejected = self._rule_scores_for_jobs(pivot, others)
+            passed = np.fromiter(
+                (category_matching.passes_hard_filters(job, pivot) for job in others),
+                dtype=bool, count=len(others)
             )
+        rejected |= ~passed
+
+        # Rejected pairs are never embedded
+        similarities = np.zeros(len(others))
+        final_scores = self.RULE_WEIGHT * rule_scores
+        eligible = np.flatnonzero(~rejected)
+        if len(eligible):
+            try:
+                if pivot_is_job:
+                    scored = pool.take(eligible)
+                    scored = replace(scored, emb=self.get_candidate_vectors(scored.candidates))
+                    similarities[eligible], final_scores[eligible] = category_matching.score_pool_fused(
+                        self.get_job_vector(pivot),
+                        scored,
+                        rule_scores[eligible],
+                        self.SEMANTIC_WEIGHT,
+                        self.RULE_WEIGHT
+                    )
+                else:
+                    similarities[eligible] = self._batch_semantic_scores(
+                        self.get_candidate_vector(pivot),
+                        self._get_job_embeddings([others[i] for i in eligible])
+                    )
+                    final_scores[eligible] += self.SEMANTIC_WEIGHT * similarities[eligible]
+            except Exception as e:
+                logger.warning(f"Batched semantic scoring failed for {pivot.id}: {e}")
+
+        # With a threshold, build explained matches only for pairs that
+        # can reach it
+        evaluate = range(len(others))
+        if min_score > 0:
+            # NaN (failed to score) stays in; the exact check happens below
+            evaluate = np.flatnonzero(~rejected & ~(final_scores * 100 < min_score - 0.01))
+
+        results = []
+
+        for i in evaluate:
+            if pivot_is_job:
+                job, candidate, subject = pivot, others[i], "candidate"
+            else:
+                job, candidate, subject = others[i], pivot, "job"
+            # Response dicts are built directly, and None when below min_score
+            entry = self._match_fast(job, candidate, float(similarities[i]), min_score, subject)
+            if entry is not None:
+                results.append(entry)
+
+        # Sort by score descending
+        return _top_by_score(results, top_k)
 
     def rank_candidates_for_job(
             self,
             job: JobDB,
             candidates: List[CandidateDB],
-            min_score: float = 0.0
+            min_score: float = 0.0,
+            top_k: Optional[int] = None
     ) -> List[Dict]:
         """
         Rank candidates for a specific job.
@@ -548,6 +1306,7 @@ class MatchingService:
             job: Job to match against
             candidates: List of candidates to evaluate
             min_score: Minimum score threshold (0-100)
+            top_k: Return only the best top_k results (default: all)
 
         Returns:
             List of match results sorted by score (highest first)
@@ -557,45 +1316,7 @@ class MatchingService:
             f"(min_score={min_score})"
         )
 
-        results = []
-
-        for candidate in candidates:
-            try:
-                match = self._calculate_match(job, candidate)
-
-                # Apply minimum score filter
-                if match.score < min_score:
-                    logger.debug(
-                        f"Filtered out candidate {candidate.id} "
-                        f"(score {match.score} < {min_score})"
-                    )
-                    continue
-
-                # Convert to dict format for API response
-                results.append({
-                    "candidate": match.candidate,
-                    "score": match.score,
-                    "semantic_score": match.semantic_score,
-                    "rule_score": match.rule_score,
-                    "match_reasons": match.match_reasons,
-                    "breakdown": {
-                        "location": match.breakdown.location_match if match.breakdown else 0,
-                        "salary": match.breakdown.salary_match if match.breakdown else 0,
-                        "requirements": match.breakdown.requirements_match if match.breakdown else 0,
-                        "advantages": match.breakdown.advantages_match if match.breakdown else 0,
-                        "languages": match.breakdown.language_match if match.breakdown else 0,
-                    }
-                })
-
-            except Exception as e:
-                logger.warning(
-                    f"Failed to match candidate {candidate.id}: {e}",
-                    exc_info=True
-                )
-                continue
-
-        # Sort by score descending
-        results.sort(key=lambda x: x["score"], reverse=True)
+        results = self._rank(job, candidates, True, min_score, top_k)
 
         logger.info(
             f"Ranked {len(results)} candidates "
@@ -608,7 +1329,8 @@ class MatchingService:
             self,
             candidate: CandidateDB,
             jobs: List[JobDB],
-            min_score: float = 0.0
+            min_score: float = 0.0,
+            top_k: Optional[int] = None
     ) -> List[Dict]:
         """
         Rank jobs for a specific candidate.
@@ -617,6 +1339,7 @@ class MatchingService:
             candidate: Candidate to match against
             jobs: List of jobs to evaluate
             min_score: Minimum score threshold (0-100)
+            top_k: Return only the best top_k results (default: all)
 
         Returns:
             List of match results sorted by score (highest first)
@@ -626,142 +1349,269 @@ class MatchingService:
             f"(min_score={min_score})"
         )
 
-        results = []
+        results = self._rank(candidate, jobs, False, min_score, top_k)
+
+        logger.info(
+            f"Ranked {len(results)} jobs "
+            f"(filtered {len(jobs) - len(results)})"
+        )
+
+        return results
+
+    def rank_jobs_two_stage(
+            self,
+            candidate: CandidateDB,
+            jobs: List[JobDB],
+            min_score: float = 0.0,
+            k: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Rank jobs for a candidate in two stages and return the top k.
+
+        Stage 1 scores every job with the cheap rule-based scorer.
+        Stage 2 runs the batched semantic scoring only on the best
+        max(TWO_STAGE_OVERSAMPLE * k, TWO_STAGE_MIN_SHORTLIST) jobs from
+        stage 1.
+
+        Args:
+            candidate: Candidate to match against
+            jobs: List of jobs to evaluate
+            min_score: Minimum score threshold (0-100)
+            k: Number of results wanted. If None, every job is scored
+                semantically.
 
+        Returns:
+            Up to k match results sorted by score (highest first)
+        """
+        if k:
+            shortlist_size = max(self.TWO_STAGE_OVERSAMPLE * k, self.TWO_STAGE_MIN_SHORTLIST)
+        else:
+            shortlist_size = len(jobs)
+        if len(jobs) <= shortlist_size:
+            return self._rank(candidate, jobs, False, min_score, k)
+
+        # Stage 1: rule-based pre-ranking. Hard-filter rejections sort last.
+        rule_ranked = []
         for job in jobs:
             try:
-                match = self._calculate_match(job, candidate)
-
-                # Apply minimum score filter
-                if match.score < min_score:
-                    continue
-
-                # Convert to dict format for API response
-                results.append({
-                    "job": match.job,
-                    "score": match.score,
-                    "semantic_score": match.semantic_score,
-                    "rule_score": match.rule_score,
-                    "match_reasons": match.match_reasons,
-                    "breakdown": {
-                        "location": match.breakdown.location_match if match.breakdown else 0,
-                        "salary": match.breakdown.salary_match if match.breakdown else 0,
-                        "requirements": match.breakdown.requirements_match if match.breakdown else 0,
-                        "advantages": match.breakdown.advantages_match if match.breakdown else 0,
-                        "languages": match.breakdown.language_match if match.breakdown else 0,
-                    }
-                })
-
+                rule_score, breakdown, _ = self._calculate_rule_score(job, candidate, explain=False)
             except Exception as e:
-                logger.warning(
-                    f"Failed to match job {job.id}: {e}",
-                    exc_info=True
-                )
+                logger.warning(f"Rule scoring failed for job {job.id}: {e}")
                 continue
 
-        # Sort by score descending
-        results.sort(key=lambda x: x["score"], reverse=True)
+            if (self._is_rejected(breakdown)
+                    or not category_matching.passes_hard_filters(job, candidate)):
+                rule_score = -1.0
+            rule_ranked.append((rule_score, job))
 
-        logger.info(
-            f"Ranked {len(results)} jobs "
-            f"(filtered {len(jobs) - len(results)})"
+        shortlist = heapq.nlargest(shortlist_size, rule_ranked, key=itemgetter(0))
+
+        logger.debug(
+            f"Two-stage ranking: {len(shortlist)}/{len(jobs)} jobs "
+            f"shortlisted for semantic scoring"
         )
 
-        return results
+        # Stage 2: semantic + full scoring on the shortlist
+        return self._rank(
+            candidate, [job for _, job in shortlist], False, min_score, k
+        )
+
+    async def rank_jobs_two_stage_async(
+            self,
+            candidate: CandidateDB,
+            jobs: List[JobDB],
+            min_score: float = 0.0,
+            k: Optional[int] = None
+    ) -> List[Dict]:
+        """Run rank_jobs_two_stage on the shared ranking pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            RANKING_POOL,
+            partial(self.rank_jobs_two_stage, candidate, jobs, min_score, k)
+        )
+
+    async def rank_jobs_for_candidate_async(
+            self,
+            candidate: CandidateDB,
+            jobs: List[JobDB],
+            min_score: float = 0.0,
+            top_k: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Rank jobs for a candidate without blocking the event loop.
+
+        Jobs are split into chunks of RANK_CHUNK_SIZE which are scored
+        concurrently on the shared ranking pool with _rank,
+        then merged.
+
+        Args:
+            top_k: Return only the best top_k results (default: all)
+
+        Returns:
+            List of match results sorted by score (highest first)
+        """
+        loop = asyncio.get_running_loop()
+        chunks = [
+            jobs[i:i + self.RANK_CHUNK_SIZE]
+            for i in range(0, len(jobs), self.RANK_CHUNK_SIZE)
+        ]
+
+        ranked_chunks = await asyncio.gather(*(
+            loop.run_in_executor(
+                RANKING_POOL,
+                partial(self._rank, candidate, chunk, False, min_score)
+            )
+            for chunk in chunks
+        ))
+
+        results = [match for chunk in ranked_chunks for match in chunk]
+        return _top_by_score(results, top_k)
+
+    async def rank_candidates_for_job_async(
+            self,
+            job: JobDB,
+            candidates: List[CandidateDB],
+            min_score: float = 0.0,
+            top_k: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Rank candidates for a job without blocking the event loop, using
+        every worker of the shared ranking pool.
+
+        Candidates are split into one chunk per worker (at least
+        RANK_CHUNK_SIZE each, so the batched kernels stay worthwhile),
+        ranked concurrently with rank_candidates_for_job, then merged.
+
+        Args:
+            top_k: Return only the best top_k results (default: all)
+
+        Returns:
+            List of match results sorted by score (highest first)
+        """
+        loop = asyncio.get_running_loop()
+        chunk_size = max(self.RANK_CHUNK_SIZE, -(-len(candidates) // _RANKING_WORKERS))
+        chunks = [
+            candidates[i:i + chunk_size]
+            for i in range(0, len(candidates), chunk_size)
+        ]
+
+        # Each chunk only needs its own top_k for the merged top_k
+        ranked_chunks = await asyncio.gather(*(
+            loop.run_in_executor(
+                RANKING_POOL,
+                partial(self.rank_candidates_for_job, job, chunk, min_score, top_k)
+            )
+            for chunk in chunks
+        ))
+
+        results = [match for chunk in ranked_chunks for match in chunk]
+        return _top_by_score(results, top_k)
+
+    async def rank_jobs_stream(
+            self,
+            candidate: CandidateDB,
+            jobs: List[JobDB],
+            min_score: float = 0.0,
+            limit: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Score jobs for a candidate and yield matches as soon as their
+        chunk is scored.
+
+        Chunks of RANK_CHUNK_SIZE run concurrently on the shared ranking
+        pool. A min-heap of size `limit` tracks the running top matches;
+        a match is yielded only if it enters the heap when scored.
+
+        Matches are yielded in scoring order, not sorted, and one yielded
+        early may later be pushed out of the top `limit` by a better one.
+        Consumers that need the final top list should sort and truncate.
+
+        Yields:
+            Match result dicts (same format as rank_jobs_for_candidate)
+        """
+        loop = asyncio.get_running_loop()
+        chunks = [
+            jobs[i:i + self.RANK_CHUNK_SIZE]
+            for i in range(0, len(jobs), self.RANK_CHUNK_SIZE)
+        ]
+
+        futures = [
+            loop.run_in_executor(
+                RANKING_POOL,
+                partial(self._rank, candidate, chunk, False, min_score)
+            )
+            for chunk in chunks
+        ]
+
+        # (score, seq, match) - seq breaks ties so dicts are never compared
+        heap: List[Tuple[float, int, Dict]] = []
+        seq = 0
+
+        try:
+            for future in asyncio.as_completed(futures):
+                for match in await future:
+                    item = (match["score"], seq, match)
+                    seq += 1
+
+                    if limit is None or len(heap) < limit:
+                        heapq.heappush(heap, item)
+                    elif item[0] > heap[0][0]:
+                        heapq.heapreplace(heap, item)
+                    else:
+                        continue
+
+                    yield match
+        finally:
+            # Client went away: don't leave queued chunks running
+            for future in futures:
+                future.cancel()
 
     # ------------------------------------------------------------------------
     # Utility Methods
     # ------------------------------------------------------------------------
 
+    @staticmethod
+    def _breakdown_entry(breakdown: Optional[ScoringBreakdown]) -> Dict:
+        """Rule score breakdown in the API response format (zeros if missing)."""
+        if breakdown is None:
+            return {"location": 0, "salary": 0, "requirements": 0, "advantages": 0, "languages": 0}
+        return {
+            "location": breakdown.location_match,
+            "salary": breakdown.salary_match,
+            "requirements": breakdown.requirements_match,
+            "advantages": breakdown.advantages_match,
+            "languages": breakdown.language_match,
+        }
+
     def clear_cache(self) -> None:
         """Clear the embedding cache."""
-        self._embedding_cache.clear()
+        with self._cache_lock:
+            self._embedding_cache.clear()
+        job_embedding_cache.clear()
         logger.info("Cleared embedding cache")
 
-    def get_cache_stats(self) -> Dict[str, int]:
+    def get_cache_stats(self) -> Dict:
         """Get cache statistics."""
+        lookups = self._cache_hits + self._cache_misses
         return {
             "cache_size": len(self._embedding_cache),
             "cache_maxsize": self._embedding_cache.maxsize,
-            "cache_ttl": self._embedding_cache.ttl
+            "cache_dtype": "int8" if self._cache_int8 else "float16",
+            "cache_hits": self._cache_hits,
+            "cache_misses": self._cache_misses,
+            "cache_hit_rate": round(self._cache_hits / lookups, 4) if lookups else None,
+            "job_embeddings": job_embedding_cache.stats()
         }
 
-    def _calculate_rule_score_with_category(
-            self,
-            job: JobDB,
-            candidate: CandidateDB
-    ) -> Tuple[float, ScoringBreakdown, List[str]]:
-        """
-        Calculate rule-based score with category-specific weights.
-        """
-        strategy = CategoryMatchingStrategy(job, candidate)
-        weights = strategy.get_scoring_weights()
-
-        reasons = []
-        scores = {}
-
-        # Location
-        loc_score, loc_reason = self._score_location(job, candidate)
-        scores["location"] = loc_score
-        reasons.append(f"📍 {loc_reason}")
-
-        # Salary
-        sal_score, sal_reason = self._score_salary(job, candidate)
-        scores["salary"] = sal_score
-        reasons.append(f"💰 {sal_reason}")
-
-        # Requirements
-        req_score, req_reason = self._score_requirements(job, candidate)
-        scores["requirements"] = req_score
-        reasons.append(f"✅ {req_reason}")
 
-        # Languages
-        lang_score, lang_reason = self._score_languages(job, candidate)
-        scores["languages"] = lang_score
-        reasons.append(f"🗣️ {lang_reason}")
-
-        # NEW: Availability (for non-tech jobs)
-        avail_score, avail_reason = strategy.score_availability()
-        scores["availability"] = avail_score
-        if avail_score == 0.0:
-            # Hard filter - immediate rejection
-            reasons.append(f"❌ REJECTED: {avail_reason}")
-            return 0.0, None, reasons
-        reasons.append(f"📅 {avail_reason}")
-
-        # NEW: Certifications (critical for some industries)
-        cert_score, cert_reason = strategy.score_certifications()
-        scores["certifications"] = cert_score
-        if cert_score == 0.0:
-            # Hard filter - immediate rejection
-            reasons.append(f"❌ REJECTED: {cert_reason}")
-            return 0.0, None, reasons
-        reasons.append(f"📜 {cert_reason}")
-
-        # NEW: Employment type preference
-        emp_score, emp_reason = strategy.score_employment_type()
-        scores["employment_type"] = emp_score
-        reasons.append(f"📋 {emp_reason}")
-
-        # Calculate weighted final score
-        final_score = (
-                scores["location"] * 0.15 +
-                scores["salary"] * 0.15 +
-                scores["requirements"] * weights.get("skills", 0.25) +
-                scores["languages"] * weights.get("languages", 0.15) +
-                scores["availability"] * weights.get("availability", 0.15) +
-                scores["certifications"] * weights.get("certifications", 0.10) +
-                emp_score * 0.10
-        )
-
-        # Create breakdown
-        breakdown = ScoringBreakdown(
-            location_match=scores["location"],
-            salary_match=scores["salary"],
-            requirements_match=scores["requirements"],
-            advantages_match=0.0,  # Calculate separately
-            language_match=scores["languages"],
-            semantic_similarity=0.0,  # Filled later
-        )
+# ============================================================================
+# Singleton Service
+# ============================================================================
 
-        return final_score, breakdown, reasons
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_shared_matching_service() -> MatchingService:
+    """
+    Return the process-wide MatchingService.
+    Reusing one instance keeps its embedding cache warm across requests.
+    """
+    return MatchingService()
@@ -0,0 +1,146 @@
+"""
+Shared HTTP client for the local Ollama server.
+
+One long-lived httpx.AsyncClient is reused for every generation, so
+requests ride a kept-alive connection instead of spawning an
+`ollama run` process per call. `keep_alive` keeps the model loaded in
+the server between requests.
+
+generate_json streams the response and stops reading as soon as the
+first top-level JSON object is complete, so trailing text the model
+produces after the object is never waited for.
+"""
+
+import json
+import logging
+from typing import Optional
+
+import httpx
+
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_ollama_client() -> httpx.AsyncClient:
+    """Return the process-wide Ollama client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=settings.OLLAMA_URL,
+            timeout=settings.OLLAMA_TIMEOUT
+        )
+    return _client
+
+
+async def close_ollama_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def generate(prompt: str, model: Optional[str] = None, timeout: Optional[float] = None) -> str:
+    """
+    Run a non-streaming generation and return the model's full response.
+
+    Raises:
+        httpx.HTTPError: On connection errors, timeouts or non-2xx responses
+    """
+    resp = await get_ollama_client().post(
+        "/api/generate",
+        json={
+            "model": model or settings.OLLAMA_MODEL,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": settings.OLLAMA_KEEP_ALIVE,
+        },
+        timeout=timeout or settings.OLLAMA_TIMEOUT
+    )
+    resp.raise_for_status()
+    return resp.json().get("response", "")
+
+
+class _JsonObjectTracker:
+    """Track brace depth over streamed text, ignoring braces inside strings."""
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> int:
+        """
+        Consume text.
+
+        Returns:
+            Index just past the character that closed the first object,
+            or -1 if it is not closed yet
+        """
+        for i, ch in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                if self.started:
+                    self.in_string = True
+            elif ch == "{":
+                self.depth += 1
+                self.started = True
+            elif ch == "}" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return i + 1
+        return -1
+
+
+async def generate_json(prompt: str, model: Optional[str] = None, timeout: Optional[float] = None) -> str:
+    """
+    Stream a generation and return the text up to the end of the first
+    complete top-level `{...}` object (or everything, if none closes).
+
+    Raises:
+        httpx.HTTPError: On connection errors, timeouts or non-2xx responses
+    """
+    buffer = []
+    tracker = _JsonObjectTracker()
+
+    async with get_ollama_client().stream(
+        "POST",
+        "/api/generate",
+        json={
+            "model": model or settings.OLLAMA_MODEL,
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": settings.OLLAMA_KEEP_ALIVE,
+        },
+        timeout=timeout or settings.OLLAMA_TIMEOUT
+    ) as resp:
+        resp.raise_for_status()
+
+        async for line in resp.aiter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            piece = chunk.get("response", "")
+
+            end = tracker.feed(piece)
+            if end >= 0:
+                buffer.append(piece[:end])
+                # Leaving the block closes the response; the server stops generating
+                logger.debug("Ollama JSON object complete, stopping stream early")
+                break
+
+            buffer.append(piece)
+            if chunk.get("done"):
+                break
+
+    return "".join(buffer)
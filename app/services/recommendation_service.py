@@ -43,12 +43,12 @@ def calculate_recommendation_score(job, candidate):
     # 4. MANDATORY REQUIREMENTS (strict)
     # "requirements" = must-have skills
     # -----------------------------------
-    mandatory = set(job.requirements or [])
-    candidate_exp_text = " ".join(candidate.experience).lower()
+    # Lowercased once per loaded job / candidate, not per call
+    candidate_exp_text = candidate.experience_lower
 
     # All mandatory skills must appear in experience
-    for req in mandatory:
-        if req.lower() not in candidate_exp_text:
+    for req in job.requirements_lower:
+        if req not in candidate_exp_text:
             return None  # missing a must-have skill
 
     rule_score += 20
@@ -57,12 +57,7 @@ def calculate_recommendation_score(job, candidate):
     # 5. ADVANTAGES (soft match)
     # "advantages" = nice-to-have skills
     # -----------------------------------
-    advantages = job.advantages or []
-    adv_matches = 0
-
-    for adv in advantages:
-        if adv.lower() in candidate_exp_text:
-            adv_matches += 1
+    adv_matches = sum(1 for adv in job.advantages_lower if adv in candidate_exp_text)
 
     semantic_score += min(20, adv_matches * 5)  # max 20 points
 
@@ -0,0 +1,151 @@
+"""
+Semantic caches for match results.
+
+Candidates whose profile embeddings are nearly identical (cosine above
+SEMANTIC_CACHE_THRESHOLD) get the same ranked job list, and paraphrased
+job posts get the same ranked candidate list, so a stored result can be
+reused instead of running the matching pipeline again.
+
+Only the free-text part of a profile or post is compared semantically.
+Fields the rule-based scorers and hard filters read (location, salary,
+skills, experience, languages, requirements, certifications,
+availability, employment type) and the request's parameters must match
+exactly, so a hit never changes rule scores. Any change to the other side
+of the match (jobs for candidate results, candidates for job results)
+bumps a generation counter, which retires all earlier entries.
+"""
+
+import itertools
+import logging
+import threading
+from typing import Any, Hashable, Optional, Tuple
+
+import numpy as np
+from cachetools import TTLCache
+
+from app.config import settings
+from app.domain.models import CandidateDB, JobDB
+
+
+logger = logging.getLogger(__name__)
+
+
+def candidate_cache_key(candidate: CandidateDB, min_score: float, limit: int) -> Tuple:
+    """Exact-match part of the cache key: the inputs to rule-based scoring."""
+    return (
+        candidate.location_lower,
+        candidate.salary_expectation,
+        tuple(candidate.experience),
+        tuple(candidate.skills),
+        tuple(candidate.languages),
+        tuple(candidate.certifications),
+        candidate.willing_to_work_shifts,
+        candidate.willing_to_work_weekends,
+        candidate.preferred_employment_type,
+        min_score,
+        limit,
+    )
+
+
+def job_cache_key(job: JobDB) -> Tuple:
+    """Exact-match part of the cache key: the inputs to recommendation scoring."""
+    return (
+        job.location_lower,
+        job.salary_max,
+        tuple(job.required_languages),
+        tuple(job.requirements),
+        tuple(job.advantages),
+    )
+
+
+class SemanticCache:
+    """Thread-safe nearest-neighbour cache keyed by normalized embeddings."""
+
+    def __init__(self, maxsize: int, ttl: int, threshold: float):
+        self.threshold = threshold
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._ids = itertools.count()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def invalidate(self) -> None:
+        """Retire every stored entry (called when the matched corpus changes)."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def lookup(self, vector: np.ndarray, key: Hashable) -> Optional[Any]:
+        """
+        Find a stored value for an embedding close to `vector`.
+
+        Args:
+            vector: L2-normalized query embedding
+            key: Exact-match part of the key
+
+        Returns:
+            The stored value, or None on a miss
+        """
+        with self._lock:
+            candidates = [
+                (vec, value)
+                for gen, entry_key, vec, value in self._entries.values()
+                if gen == self._generation and entry_key == key
+            ]
+
+        if not candidates:
+            return None
+
+        similarities = np.stack([vec for vec, _ in candidates]) @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+
+        logger.debug(f"Semantic cache hit (similarity={similarities[best]:.3f})")
+        return candidates[best][1]
+
+    def store(
+            self,
+            vector: np.ndarray,
+            key: Hashable,
+            value: Any,
+            generation: Optional[int] = None
+    ) -> None:
+        """
+        Store a value for an L2-normalized embedding.
+
+        Args:
+            generation: Generation the value was computed under. If the
+                cache was invalidated since, the value is discarded.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[next(self._ids)] = (self._generation, key, vector, value)
+
+    def stats(self) -> dict:
+        return {
+            "cache_size": len(self._entries),
+            "cache_maxsize": self._entries.maxsize,
+            "generation": self._generation,
+            "threshold": self.threshold
+        }
+
+
+# Global cache for /candidates/{id}/matches results
+match_result_cache = SemanticCache(
+    maxsize=settings.SEMANTIC_CACHE_SIZE,
+    ttl=settings.CACHE_TTL,
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD
+)
+
+
+# Global cache for /recommendations/job/{id} results
+recommendation_cache = SemanticCache(
+    maxsize=settings.SEMANTIC_CACHE_SIZE,
+    ttl=settings.CACHE_TTL,
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD
+)
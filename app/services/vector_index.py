@@ -0,0 +1,242 @@
+"""
+In-memory nearest-neighbour index over L2-normalized embeddings.
+
+Used to shortlist the most similar items before full scoring, so the
+expensive rule + semantic pipeline only runs on a small top-K subset.
+
+Uses a FAISS HNSW graph when faiss is installed and the corpus is large
+enough to benefit; otherwise falls back to an exact numpy top-K. After a
+change the index is rebuilt on a background thread, off the lock; searches
+keep using the previous index until the new one is swapped in, so writes
+become visible to search with a short delay.
+
+With ANN_INDEX_FACTORY set (e.g. "IVF4096,PQ32"), large corpora use a
+trained, compressed FAISS index instead of HNSW, optionally moved to all
+GPUs (ANN_USE_GPU).
+
+Vectors are stored as float16 (half the memory and bandwidth of float32,
+with negligible effect on cosine ranking). The exact scan upcasts one
+block at a time, and the HNSW graph keeps fp16 codes via a scalar
+quantizer.
+"""
+
+import logging
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.config import settings
+
+try:
+    import faiss  # Optional: pip install faiss-cpu
+except ImportError:
+    faiss = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class VectorIndex:
+    """Thread-safe top-K inner-product index keyed by string ids."""
+
+    # Below this size an exact numpy scan is as fast as HNSW
+    HNSW_MIN_SIZE = 5000
+    HNSW_NEIGHBORS = 32
+
+    # IVF needs this many training points per inverted list
+    IVF_TRAIN_POINTS_PER_LIST = 39
+
+    # Rows upcast to float32 per step of the exact scan
+    SCAN_BLOCK_ROWS = 8192
+
+    def __init__(self, name: str):
+        self.name = name
+        self.ready = False
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._ids: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._ann = None
+        self._dirty = True
+        self._rebuilding = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def upsert_many(self, ids: List[str], vectors) -> None:
+        """Add or replace vectors (aligned with `ids` by position)."""
+        with self._lock:
+            for item_id, vector in zip(ids, vectors):
+                self._vectors[item_id] = vector
+            self._dirty = True
+
+    def remove(self, item_id: str) -> None:
+        with self._lock:
+            if self._vectors.pop(item_id, None) is not None:
+                self._dirty = True
+
+    def mark_ready(self) -> None:
+        """Build the initial index (called off the event loop) and enable searches."""
+        with self._lock:
+            rebuild = self._schedule_rebuild()
+        if rebuild:
+            self._rebuild()
+        self.ready = True
+        logger.info(f"Vector index '{self.name}' ready with {len(self)} items")
+
+    def _build(self, vectors: Dict[str, np.ndarray]):
+        """
+        Build search structures from a snapshot of the vectors. Runs
+        without the lock.
+
+        Returns:
+            (ids, matrix, ann)
+        """
+        ids = list(vectors)
+        if not ids:
+            return ids, None, None
+
+        matrix = np.stack([vectors[i] for i in ids]).astype(np.float16)
+
+        ann = None
+        if faiss is not None and len(ids) >= self.HNSW_MIN_SIZE:
+            matrix32 = matrix.astype(np.float32)
+            ann = self._build_factory_index(matrix32) if settings.ANN_INDEX_FACTORY else None
+            if ann is None:
+                ann = self._build_hnsw_index(matrix32)
+
+        logger.debug(
+            f"Rebuilt vector index '{self.name}' "
+            f"({len(ids)} items, ann={type(ann).__name__ if ann is not None else None})"
+        )
+        return ids, matrix, ann
+
+    def _rebuild(self) -> None:
+        """
+        Rebuild until no changes are pending, swapping each result in under
+        the lock. Only one rebuild runs at a time (see _rebuilding).
+        """
+        try:
+            while True:
+                with self._lock:
+                    if not self._dirty:
+                        return
+                    snapshot = dict(self._vectors)
+                    self._dirty = False
+
+                built = self._build(snapshot)
+
+                with self._lock:
+                    self._ids, self._matrix, self._ann = built
+        except Exception as e:
+            logger.error(f"Failed to rebuild vector index '{self.name}': {e}", exc_info=True)
+            with self._lock:
+                self._dirty = True  # Retried on the next search
+        finally:
+            with self._lock:
+                self._rebuilding = False
+
+    def _schedule_rebuild(self) -> bool:
+        """
+        Claim the rebuild if changes are pending and none is running
+        (lock held).
+
+        Returns:
+            True if the caller must now run _rebuild()
+        """
+        if not self._dirty or self._rebuilding:
+            return False
+        self._rebuilding = True
+        return True
+
+    def _build_hnsw_index(self, matrix: np.ndarray):
+        index = faiss.IndexHNSWSQ(
+            matrix.shape[1],
+            faiss.ScalarQuantizer.QT_fp16,
+            self.HNSW_NEIGHBORS,
+            faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(matrix)  # No-op for fp16, but required by the SQ index
+        index.add(matrix)
+        return index
+
+    def _build_factory_index(self, matrix: np.ndarray):
+        """
+        Train and fill the ANN_INDEX_FACTORY index (None if it can't be built,
+        e.g. too few vectors to train the IVF lists).
+        """
+        try:
+            index = faiss.index_factory(
+                matrix.shape[1], settings.ANN_INDEX_FACTORY, faiss.METRIC_INNER_PRODUCT
+            )
+            nlist = getattr(faiss.try_extract_index_ivf(index), "nlist", 0)
+            if len(matrix) < nlist * self.IVF_TRAIN_POINTS_PER_LIST:
+                return None
+
+            index.train(matrix)
+            index.add(matrix)
+
+            if settings.ANN_USE_GPU and faiss.get_num_gpus() > 0:
+                index = faiss.index_cpu_to_all_gpus(index)
+                faiss.GpuParameterSpace().set_index_parameter(index, "nprobe", settings.ANN_NPROBE)
+            elif nlist:
+                faiss.ParameterSpace().set_index_parameter(index, "nprobe", settings.ANN_NPROBE)
+            return index
+        except Exception as e:
+            logger.warning(f"Could not build '{settings.ANN_INDEX_FACTORY}' index for '{self.name}': {e}")
+            return None
+
+    def _scan(self, matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Exact inner products of the fp16 rows with a float32 query."""
+        similarities = np.empty(matrix.shape[0], dtype=np.float32)
+        for start in range(0, matrix.shape[0], self.SCAN_BLOCK_ROWS):
+            block = matrix[start:start + self.SCAN_BLOCK_ROWS]
+            similarities[start:start + block.shape[0]] = block.astype(np.float32) @ query
+        return similarities
+
+    def search(self, query: np.ndarray, k: int) -> List[str]:
+        """
+        Find the ids of the `k` vectors most similar to `query`.
+
+        Args:
+            query: L2-normalized query vector
+
+        Returns:
+            Ids ordered by similarity (highest first)
+        """
+        with self._lock:
+            rebuild = self._schedule_rebuild()
+            first_build = rebuild and self._matrix is None
+            ids, matrix, ann = self._ids, self._matrix, self._ann
+
+        if first_build:
+            # Nothing to serve yet: build once on this request
+            self._rebuild()
+            with self._lock:
+                ids, matrix, ann = self._ids, self._matrix, self._ann
+        elif rebuild:
+            # Serve the previous index while the new one is built
+            threading.Thread(
+                target=self._rebuild, name=f"vector-index-{self.name}", daemon=True
+            ).start()
+
+        if matrix is None:
+            return []
+
+        k = min(k, len(ids))
+        query = np.asarray(query, dtype=np.float32).reshape(1, -1)
+
+        if ann is not None:
+            _, indices = ann.search(query, k)
+            return [ids[i] for i in indices[0] if i >= 0]
+
+        similarities = self._scan(matrix, query[0])
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        return [ids[i] for i in top]
+
+
+# Global indexes over job and candidate profile embeddings
+job_vector_index = VectorIndex("jobs")
+candidate_vector_index = VectorIndex("candidates")